@@ -0,0 +1,59 @@
+"""Command-line batch runner: python -m app MANIFEST [--workers N] [--log jobs.jsonl]
+
+See ``batch`` for the manifest format. This entry point never imports
+tkinter or ttkbootstrap, so it runs on headless servers.
+"""
+import argparse
+import sys
+import time
+
+try:
+    from . import batch, metrics, pdf_tools
+except ImportError:
+    import batch, metrics, pdf_tools
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app", description="Run merge and page-removal jobs from a manifest.")
+    parser.add_argument("manifest", help="JSON or CSV job manifest")
+    parser.add_argument("--workers", type=int, default=None, help="parallel worker processes (default: CPU count)")
+    parser.add_argument("--log", help="append one JSON line per finished job to this file")
+    parser.add_argument(
+        "--profile",
+        choices=list(pdf_tools.SAVE_PROFILES),
+        default=pdf_tools.DEFAULT_SAVE_PROFILE,
+        help="save profile for jobs that do not set one",
+    )
+    parser.add_argument("--quiet", action="store_true", help="only print the final summary")
+    parser.add_argument(
+        "--metrics", metavar="FILE", help="log timing events of every operation to FILE (JSON lines) and print a summary"
+    )
+    parser.add_argument("--cprofile", metavar="FILE", help="write a cProfile of the operations to FILE (FILE.<pid> for workers)")
+    args = parser.parse_args(argv)
+
+    try:
+        jobs = batch.load_manifest(args.manifest, args.profile)
+    except (OSError, ValueError) as e:
+        print(f"Invalid manifest: {e}", file=sys.stderr)
+        return 2
+
+    # Worker processes inherit both settings through the environment
+    if args.metrics:
+        metrics.log_to(args.metrics)
+    if args.cprofile:
+        metrics.enable_profiling(args.cprofile)
+
+    start = time.perf_counter()
+    started_at = time.time()
+    results = batch.run_batch(jobs, args.workers, args.log, progress=None if args.quiet else print)
+    failed = [result for result in results if not result.ok]
+    print(f"{len(results) - len(failed)} of {len(results)} job(s) succeeded in {time.perf_counter() - start:.1f} s")
+    for result in failed:
+        print(f"  {result.id}: {result.error}", file=sys.stderr)
+    if args.metrics:
+        print(metrics.Histograms.from_log(args.metrics, since=started_at).text())
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,216 @@
+"""Headless batch processing of merge and page-removal jobs listed in a manifest.
+
+A manifest is a JSON list of job objects (or ``{"jobs": [...]}``) or a CSV
+file with one job per row. Each job has:
+
+    id       name used in logs (default: its position in the manifest)
+    action   "merge" or "remove"
+    inputs   files to merge in order; a single PDF for "remove"
+             (CSV: separated by ";")
+    pages    for "remove": the pages to drop, e.g. "1-3,10,40-"; JSON may
+             also give a page number or a list of them (1-based)
+    output   path of the PDF to write
+    profile  save profile (default: the run's profile)
+
+Relative paths are resolved against the manifest's directory. Jobs run in
+parallel, so every job needs an output of its own that no job reads.
+Nothing here imports tkinter.
+"""
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+
+try:
+    from . import pdf_tools
+except ImportError:
+    import pdf_tools
+
+ACTIONS = ("merge", "remove")
+
+
+@dataclass
+class BatchJob:
+    id: str
+    action: str
+    inputs: list[str]
+    output: str
+    pages: str | None = None
+    profile: str = pdf_tools.DEFAULT_SAVE_PROFILE
+
+
+@dataclass
+class JobResult:
+    id: str
+    action: str
+    output: str
+    ok: bool
+    error: str | None = None
+    started: str = ""
+    seconds: float = 0.0
+    page_count: int = 0
+    size: int = 0
+    inputs: list[str] = field(default_factory=list)
+
+    def summary(self) -> str:
+        if not self.ok:
+            return f"[FAILED] {self.id}: {self.error} ({self.seconds:.2f} s)"
+        return f"[ok] {self.id}: {self.page_count} pages, {self.size / 1_048_576:.1f} MB in {self.seconds:.2f} s"
+
+
+def _path_key(path: str) -> str:
+    """Compare paths as the file system would: absolute, links resolved, case folded where it is."""
+    return os.path.normcase(os.path.realpath(path))
+
+
+def _pages_spec(pages, job_id: str) -> str:
+    """Return the 1-based range expression a manifest gives as ``pages``."""
+    if isinstance(pages, str):
+        return pages
+    if isinstance(pages, int) and not isinstance(pages, bool):
+        return str(pages)
+    if isinstance(pages, list) and pages and all(
+        isinstance(page, str) or (isinstance(page, int) and not isinstance(page, bool)) for page in pages
+    ):
+        return ",".join(str(page) for page in pages)
+    raise ValueError(f"Job {job_id}: pages must be a range expression like \"1-3,10\", got {pages!r}")
+
+
+def _job_from_record(record: dict, position: int, base_dir: str, default_profile: str) -> BatchJob:
+    def resolve(path: str) -> str:
+        return os.path.normpath(os.path.join(base_dir, os.path.expanduser(path.strip())))
+
+    job_id = str(record.get("id") or position)
+    action = (record.get("action") or "").strip().lower()
+    if action not in ACTIONS:
+        raise ValueError(f"Job {job_id}: action must be one of {', '.join(ACTIONS)}, got {action!r}")
+    inputs = record.get("inputs") or record.get("input") or []
+    if isinstance(inputs, str):
+        inputs = [path for path in inputs.split(";") if path.strip()]
+    if not inputs:
+        raise ValueError(f"Job {job_id}: no inputs")
+    if action == "remove" and len(inputs) != 1:
+        raise ValueError(f"Job {job_id}: remove takes exactly one input PDF")
+    pages = record.get("pages")
+    if action == "remove" and (pages is None or pages == "" or pages == []):
+        raise ValueError(f"Job {job_id}: remove needs the pages to drop")
+    pages = _pages_spec(pages, job_id) if action == "remove" else None
+    if not record.get("output"):
+        raise ValueError(f"Job {job_id}: no output")
+    profile = record.get("profile") or default_profile
+    if profile not in pdf_tools.SAVE_PROFILES:
+        raise ValueError(f"Job {job_id}: unknown save profile {profile!r}")
+    inputs = [resolve(path) for path in inputs]
+    output = resolve(record["output"])
+    if _path_key(output) in {_path_key(path) for path in inputs}:
+        raise ValueError(f"Job {job_id}: output {record['output']!r} is also one of its inputs")
+    return BatchJob(
+        id=job_id,
+        action=action,
+        inputs=inputs,
+        output=output,
+        pages=pages,
+        profile=profile,
+    )
+
+
+def load_manifest(path: str, default_profile: str = pdf_tools.DEFAULT_SAVE_PROFILE) -> list[BatchJob]:
+    """Read a JSON or CSV manifest and return its jobs; raises ValueError on invalid entries."""
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.lower().endswith(".csv"):
+            records = list(csv.DictReader(f))
+        else:
+            records = json.load(f)
+            if isinstance(records, dict):
+                records = records.get("jobs", [])
+    base_dir = os.path.dirname(os.path.abspath(path))
+    jobs = [_job_from_record(record, position, base_dir, default_profile) for position, record in enumerate(records, start=1)]
+    ids = [job.id for job in jobs]
+    duplicates = sorted({job_id for job_id in ids if ids.count(job_id) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate job ids: {', '.join(duplicates)}")
+    writers = {}
+    for job in jobs:
+        other = writers.setdefault(_path_key(job.output), job)
+        if other is not job:
+            raise ValueError(f"Jobs {other.id} and {job.id} both write {job.output}")
+    for job in jobs:
+        for path in job.inputs:
+            writer = writers.get(_path_key(path))
+            if writer is not None:
+                raise ValueError(f"Job {job.id} reads {path}, which job {writer.id} writes")
+    return jobs
+
+
+def run_job(job: BatchJob) -> JobResult:
+    """Run one job and report how it went; never raises for job-level failures."""
+    result = JobResult(
+        id=job.id,
+        action=job.action,
+        output=job.output,
+        ok=False,
+        started=time.strftime("%Y-%m-%dT%H:%M:%S"),
+        inputs=job.inputs,
+    )
+    start = time.perf_counter()
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(job.output)), exist_ok=True)
+        if job.action == "merge":
+            report = pdf_tools.merge_inputs(job.inputs, job.output, profile=job.profile)
+        else:
+            with pdf_tools.open_document(job.inputs[0]) as pdf_document:
+                journal = pdf_tools.EditJournal(pdf_document.page_count)
+                journal.remove(job.pages)
+                report = journal.save(pdf_document, job.output, profile=job.profile)
+        result.ok = True
+        result.page_count = report.page_count
+        result.size = report.size
+    except Exception as e:
+        result.error = str(e) or type(e).__name__
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def run_batch(jobs: list[BatchJob], workers: int | None = None, log_path: str | None = None, progress=print) -> list[JobResult]:
+    """Run independent jobs across a process pool and return their results in completion order.
+
+    Each result is appended to ``log_path`` as one JSON line as soon as its
+    job finishes, and ``progress`` receives a one-line summary of it with
+    the run's throughput so far. With one worker the jobs run in this
+    process.
+    """
+    workers = workers or os.cpu_count() or 1
+    results = []
+    start = time.perf_counter()
+    pages = written = 0
+    log = open(log_path, "a", encoding="utf-8") if log_path else None
+    try:
+
+        def record(result: JobResult) -> None:
+            nonlocal pages, written
+            results.append(result)
+            pages += result.page_count
+            written += result.size
+            if log is not None:
+                log.write(json.dumps(asdict(result)) + "\n")
+                log.flush()
+            if progress is not None:
+                elapsed = max(time.perf_counter() - start, 1e-6)
+                progress(
+                    f"{len(results)}/{len(jobs)} {result.summary()}"
+                    f" [{pages / elapsed:.0f} pages/s, {written / 1_048_576 / elapsed:.1f} MB/s so far]"
+                )
+
+        if workers <= 1 or len(jobs) <= 1:
+            for job in jobs:
+                record(run_job(job))
+        else:
+            with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+                for future in as_completed([pool.submit(run_job, job) for job in jobs]):
+                    record(future.result())
+    finally:
+        if log is not None:
+            log.close()
+    return results
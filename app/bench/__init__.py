@@ -0,0 +1,11 @@
+"""Headless benchmarks for pdf_tools.
+
+    python -m app.bench run [--scale quick|standard] [--out results.json]
+    python -m app.bench compare baseline.json results.json [--threshold 0.10]
+    python -m app.bench scaling [file.pdf] [--workers 1,2,4,8]
+
+``corpus`` generates deterministic synthetic inputs, ``runner`` times and
+memory-profiles each operation, and ``scaling`` measures how parallel
+rendering throughput changes with the worker count. Nothing here imports
+tkinter.
+"""
@@ -0,0 +1,92 @@
+import argparse
+import os
+import sys
+import tempfile
+
+try:
+    from . import corpus, runner, scaling
+except ImportError:
+    import corpus, runner, scaling
+
+
+def _corpus_dir(args) -> str:
+    return args.corpus or os.path.join(tempfile.gettempdir(), f"pdf_toolkit_bench_{args.scale}")
+
+
+def cmd_run(args) -> int:
+    print(f"Building corpus in {_corpus_dir(args)}")
+    files = corpus.build_corpus(_corpus_dir(args), args.scale)
+    results = runner.run(files, args.case or None, repeat=args.repeat)
+    results["meta"]["scale"] = args.scale
+    if args.out:
+        runner.save_results(results, args.out)
+        print(f"Results written to {args.out}")
+    if args.baseline:
+        return _report(runner.compare(runner.load_results(args.baseline), results, args.threshold, args.memory_threshold))
+    return 0
+
+
+def cmd_compare(args) -> int:
+    baseline = runner.load_results(args.baseline)
+    current = runner.load_results(args.current)
+    return _report(runner.compare(baseline, current, args.threshold, args.memory_threshold))
+
+
+def _report(failures: list[str]) -> int:
+    if not failures:
+        print("No regressions.")
+        return 0
+    print("Regressions:")
+    for failure in failures:
+        print(f"  {failure}")
+    return 1
+
+
+def cmd_scaling(args) -> int:
+    worker_counts = [int(n) for n in args.workers.split(",")] if args.workers else scaling.default_worker_counts()
+    size = tuple(int(n) for n in args.size.lower().split("x")) if args.size else None
+    if args.file:
+        scaling.run(args.file, worker_counts, size)
+        return 0
+    with tempfile.TemporaryDirectory() as tmp:
+        file_path = os.path.join(tmp, "sample.pdf")
+        corpus.text_pdf(file_path, args.pages)
+        scaling.run(file_path, worker_counts, size)
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.bench", description="Benchmarks for pdf_tools.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    thresholds = argparse.ArgumentParser(add_help=False)
+    thresholds.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown as a fraction (default 0.10)")
+    thresholds.add_argument("--memory-threshold", type=float, default=None, help="allowed peak RSS growth as a fraction")
+
+    run = commands.add_parser("run", parents=[thresholds], help="time every operation on a synthetic corpus")
+    run.add_argument("--scale", choices=sorted(corpus.SCALES), default="quick")
+    run.add_argument("--corpus", help="directory for the generated corpus (reused between runs)")
+    run.add_argument("--case", action="append", choices=sorted(runner.CASES), help="run only this case (repeatable)")
+    run.add_argument("--repeat", type=int, default=3, help="timed runs per case; the fastest is kept")
+    run.add_argument("--out", help="write results as JSON")
+    run.add_argument("--baseline", help="fail if results regress against this JSON file")
+    run.set_defaults(func=cmd_run)
+
+    cmp = commands.add_parser("compare", parents=[thresholds], help="compare two result files")
+    cmp.add_argument("baseline")
+    cmp.add_argument("current")
+    cmp.set_defaults(func=cmd_compare)
+
+    scale = commands.add_parser("scaling", help="parallel rendering throughput by worker count")
+    scale.add_argument("file", nargs="?", help="PDF to render (default: generate a synthetic one)")
+    scale.add_argument("--pages", type=int, default=400, help="pages in the synthetic PDF")
+    scale.add_argument("--workers", help="comma-separated worker counts")
+    scale.add_argument("--size", help="output box as WIDTHxHEIGHT (default: native 72 dpi)")
+    scale.set_defaults(func=cmd_scaling)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
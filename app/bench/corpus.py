@@ -0,0 +1,167 @@
+"""Deterministic synthetic inputs for the benchmarks.
+
+Every generator is seeded, so the same arguments always produce the same
+pages and pixels. ``build_corpus`` writes a full set into a directory and
+skips files that already exist, so a corpus can be reused between runs.
+"""
+import io
+import os
+import random
+
+import fitz  # PyMuPDF
+from PIL import Image
+
+# Corpus sizes: pages per document and number of queued images
+SCALES = {
+    "quick": {"text_pages": 40, "scanned_pages": 10, "huge_pages": 2000, "images": 6, "statements": 60},
+    "standard": {"text_pages": 300, "scanned_pages": 60, "huge_pages": 20000, "images": 24, "statements": 1000},
+}
+
+_WORDS = "invoice contract total amount due customer account statement period balance payment reference".split()
+
+
+def text_pdf(path: str, page_count: int, seed: int = 0) -> None:
+    """Write a PDF of ``page_count`` pages with 40 lines of text and some line art each."""
+    rng = random.Random(seed)
+    pdf_document = fitz.open()
+    for page_num in range(page_count):
+        page = pdf_document.new_page()
+        for line in range(40):
+            words = " ".join(rng.choice(_WORDS) for _ in range(10))
+            page.insert_text((50, 60 + line * 18), f"{page_num + 1}.{line + 1} {words}")
+        for i in range(10):
+            page.draw_circle((300, 420), 10 + i * 20, color=(i / 10, 0.2, 1 - i / 10))
+    pdf_document.save(path, garbage=2, deflate=True, no_new_id=True)
+    pdf_document.close()
+
+
+def noise_image(width: int, height: int, seed: int = 0, mode: str = "L") -> Image.Image:
+    """Return a reproducible image of blocky noise, which compresses like a real scan."""
+    rng = random.Random(seed)
+    small_size = (max(1, width // 8), max(1, height // 8))
+    small = Image.frombytes(mode, small_size, rng.randbytes(small_size[0] * small_size[1] * len(mode)))
+    return small.resize((width, height), Image.Resampling.BILINEAR)
+
+
+def scanned_pdf(path: str, page_count: int, dpi: int = 300, seed: int = 0) -> None:
+    """Write a PDF of full-page grayscale JPEG "scans" at ``dpi`` on US Letter pages."""
+    pdf_document = fitz.open()
+    for page_num in range(page_count):
+        page = pdf_document.new_page(width=612, height=792)
+        img = noise_image(int(8.5 * dpi), 11 * dpi, seed + page_num)
+        page.insert_image(page.rect, stream=_encode(img, "JPEG"))
+    pdf_document.save(path, garbage=2, deflate=True, no_new_id=True)
+    pdf_document.close()
+
+
+def huge_pdf(path: str, page_count: int) -> None:
+    """Write a PDF with ``page_count`` pages carrying one short line each."""
+    pdf_document = fitz.open()
+    for page_num in range(page_count):
+        pdf_document.new_page().insert_text((72, 72), f"Page {page_num + 1}")
+    pdf_document.save(path, garbage=2, deflate=True, no_new_id=True)
+    pdf_document.close()
+
+
+def statement_repeats(statement_count: int) -> list[int]:
+    """0-based pages of ``statements_pdf`` that repeat the page before them."""
+    return [i + i // 10 + 1 for i in range(0, statement_count, 10)]
+
+
+def _scan(page: fitz.Page, shift: int, seed: int) -> bytes:
+    """A 100 dpi JPEG "scan" of ``page`` on grey, noisy paper, offset by ``shift`` pixels."""
+    pix = page.get_pixmap(dpi=100, colorspace=fitz.csGRAY)
+    img = Image.frombytes("L", (pix.width, pix.height), pix.samples)
+    img = img.transform(img.size, Image.Transform.AFFINE, (1, 0, shift, 0, 1, shift), fillcolor=255)
+    paper = noise_image(img.width, img.height, seed).point(lambda v: 235 + v // 25)
+    img = Image.composite(img, paper, img.point(lambda v: 255 if v < 200 else 0))
+    buffer = io.BytesIO()
+    img.save(buffer, format="JPEG", quality=70)
+    return buffer.getvalue()
+
+
+def statements_pdf(path: str, statement_count: int, scanned: bool = False, seed: int = 0) -> None:
+    """Write one-page bank statements sharing a layout, each tenth one twice (see ``statement_repeats``).
+
+    Statements differ only in their account number and figures, so they look
+    alike at thumbnail size; the repeats are the only true duplicates. With
+    ``scanned``, pages are JPEG scans and each repeat is a rescan shifted by
+    a few pixels.
+    """
+    rng = random.Random(seed)
+    source = fitz.open()
+    for i in range(statement_count):
+        page = source.new_page()
+        page.draw_rect(fitz.Rect(36, 36, 576, 96), color=(0.1, 0.2, 0.5), fill=(0.1, 0.2, 0.5))
+        page.insert_text((50, 75), "ACME Bank - Monthly Statement", fontsize=20, color=(1, 1, 1))
+        page.insert_text((50, 130), f"Account {rng.randrange(10**7):07d}   Period 2026-{i % 12 + 1:02d}", fontsize=11)
+        for line in range(12):
+            page.insert_text(
+                (50, 170 + 24 * line),
+                f"2026-{i % 12 + 1:02d}-{line + 1:02d}  Transaction {line + 1:2d}"
+                f"   {rng.uniform(-900, 900):10.2f}   {rng.uniform(0, 9999):10.2f}",
+                fontsize=11,
+            )
+    pdf_document = fitz.open()
+    for i, page in enumerate(source):
+        for copy in range(2 if i % 10 == 0 else 1):
+            if scanned:
+                pdf_document.new_page().insert_image(page.rect, stream=_scan(page, 3 * copy, seed + 2 * i + copy))
+            else:
+                pdf_document.insert_pdf(source, from_page=i, to_page=i)
+    pdf_document.save(path, garbage=2, deflate=True, no_new_id=True)
+    pdf_document.close()
+    source.close()
+
+
+def image_queue(directory: str, count: int, seed: int = 0) -> list[str]:
+    """Write ``count`` JPG and PNG files of varied sizes and return their paths in order."""
+    rng = random.Random(seed)
+    paths = []
+    for index in range(count):
+        width, height = rng.choice([(640, 480), (1600, 1200), (2550, 3300), (4000, 3000)])
+        ext = "jpg" if index % 2 == 0 else "png"
+        path = os.path.join(directory, f"image_{index:03d}.{ext}")
+        if not os.path.exists(path):
+            img = noise_image(width, height, seed + index, "RGB")
+            with open(path, "wb") as f:
+                f.write(_encode(img, "JPEG" if ext == "jpg" else "PNG"))
+        paths.append(path)
+    return paths
+
+
+def _encode(img: Image.Image, fmt: str) -> bytes:
+    buffer = io.BytesIO()
+    if fmt == "JPEG":
+        img.save(buffer, format=fmt, quality=85)
+    else:
+        img.save(buffer, format=fmt)
+    return buffer.getvalue()
+
+
+def build_corpus(directory: str, scale: str = "quick") -> dict:
+    """Generate (or reuse) a corpus in ``directory`` and return the paths of its parts."""
+    sizes = SCALES[scale]
+    os.makedirs(directory, exist_ok=True)
+    corpus = {
+        "text": os.path.join(directory, f"text_{sizes['text_pages']}.pdf"),
+        "scanned": os.path.join(directory, f"scanned_{sizes['scanned_pages']}.pdf"),
+        "huge": os.path.join(directory, f"huge_{sizes['huge_pages']}.pdf"),
+        "statements": os.path.join(directory, f"statements_{sizes['statements']}.pdf"),
+        "scanned_statements": os.path.join(directory, f"scanned_statements_{sizes['statements']}.pdf"),
+    }
+    if not os.path.exists(corpus["text"]):
+        text_pdf(corpus["text"], sizes["text_pages"])
+    if not os.path.exists(corpus["scanned"]):
+        scanned_pdf(corpus["scanned"], sizes["scanned_pages"])
+    if not os.path.exists(corpus["huge"]):
+        huge_pdf(corpus["huge"], sizes["huge_pages"])
+    if not os.path.exists(corpus["statements"]):
+        statements_pdf(corpus["statements"], sizes["statements"])
+    if not os.path.exists(corpus["scanned_statements"]):
+        statements_pdf(corpus["scanned_statements"], sizes["statements"], scanned=True)
+    corpus["statement_repeats"] = statement_repeats(sizes["statements"])
+    image_dir = os.path.join(directory, "images")
+    os.makedirs(image_dir, exist_ok=True)
+    corpus["images"] = image_queue(image_dir, sizes["images"])
+    return corpus
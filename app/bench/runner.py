@@ -0,0 +1,190 @@
+"""Timing and memory measurement of pdf_tools operations.
+
+Each case runs in a fresh worker process so its peak RSS is not hidden by
+an earlier case's high-water mark. A case is timed ``repeat`` times (the
+fastest run is kept) and then run once more under tracemalloc.
+"""
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import fitz  # PyMuPDF
+
+try:
+    from .. import pdf_tools
+except ImportError:
+    import pdf_tools
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def _load_first_page(corpus, tmp):
+    pages = pdf_tools.load_pdf(corpus["text"])
+    pages.get(0, "preview")
+    pages.clear()
+    return 1
+
+
+def _render_previews(name):
+    def case(corpus, tmp):
+        pages = pdf_tools.load_pdf(corpus[name])
+        for index in range(len(pages)):
+            pages.get(index, "preview")
+        count = len(pages)
+        pages.clear()
+        return count
+
+    return case
+
+
+def _render_parallel(corpus, tmp):
+    return sum(1 for _ in pdf_tools.render_pages(corpus["scanned"], size=pdf_tools.RENDER_TIERS["preview"]))
+
+
+def _page_count(corpus, tmp):
+    return pdf_tools.get_page_count(corpus["huge"])
+
+
+def _merge(names, profile="balanced"):
+    def case(corpus, tmp):
+        inputs = []
+        for name in names:
+            inputs.extend(corpus[name] if name == "images" else [corpus[name]])
+        return pdf_tools.merge_inputs(inputs, os.path.join(tmp, "merged.pdf"), profile=profile).page_count
+
+    return case
+
+
+def _remove_half(corpus, tmp):
+    with pdf_tools.open_document(corpus["huge"]) as pdf_document:
+        journal = pdf_tools.EditJournal(pdf_document.page_count)
+        journal.remove(f"1-{pdf_document.page_count // 2}")
+        journal.save(pdf_document, os.path.join(tmp, "trimmed.pdf"))
+        return pdf_document.page_count
+
+
+def _analyze(name):
+    def case(corpus, tmp):
+        # Also a correctness check: statements share a layout, so a loose
+        # near-duplicate test would flag most of them instead of the repeats
+        analysis = pdf_tools.analyze_pages(corpus[name])
+        if sorted(analysis.flagged) != corpus["statement_repeats"]:
+            raise RuntimeError(f"{name}: flagged pages {analysis.flagged}, expected {corpus['statement_repeats']}")
+        return len(analysis.ink)
+
+    return case
+
+
+# Benchmark cases: name -> callable(corpus, tmp_dir) returning the number of pages processed
+CASES = {
+    "get_page_count/huge": _page_count,
+    "load_pdf/first_page": _load_first_page,
+    "render_preview/text": _render_previews("text"),
+    "render_preview/scanned": _render_previews("scanned"),
+    "render_pages/scanned": _render_parallel,
+    "merge/pdfs": _merge(["text", "scanned"]),
+    "merge/images": _merge(["images"]),
+    "merge/pdfs_smallest": _merge(["text", "scanned"], profile="smallest"),
+    "remove_pages/huge": _remove_half,
+    "analyze_pages/statements": _analyze("statements"),
+    "analyze_pages/scanned_statements": _analyze("scanned_statements"),
+}
+
+
+def _max_rss_bytes() -> int | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # kilobytes everywhere else
+
+
+def measure_case(name: str, corpus: dict, repeat: int = 3) -> dict:
+    """Run one case in this process and return its measurements."""
+    case = CASES[name]
+    rss_before = _max_rss_bytes()
+    with tempfile.TemporaryDirectory() as tmp:
+        best = None
+        for _ in range(repeat):
+            # Every repetition parses its files again; pooled handles would hide open/parse cost
+            pdf_tools.sessions.close_all()
+            start = time.perf_counter()
+            pages = case(corpus, tmp)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        rss_after = _max_rss_bytes()
+
+        pdf_tools.sessions.close_all()
+        tracemalloc.start()
+        case(corpus, tmp)
+        _, traced_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        "seconds": best,
+        "pages": pages,
+        "pages_per_s": pages / best if best else None,
+        "tracemalloc_peak": traced_peak,
+        "rss_peak": rss_after,
+        "rss_growth": rss_after - rss_before if rss_before is not None else None,
+    }
+
+
+def run(corpus: dict, names: list[str] | None = None, repeat: int = 3, progress=print) -> dict:
+    """Measure each named case (all by default) in its own process and return a results document."""
+    results = {}
+    for name in names or list(CASES):
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+            results[name] = pool.submit(measure_case, name, corpus, repeat).result()
+        if progress is not None:
+            r = results[name]
+            progress(f"{name:<26} {r['seconds']:>8.3f} s {r['pages_per_s'] or 0:>10.1f} pages/s")
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "pymupdf": fitz.VersionBind,
+            "cpus": os.cpu_count(),
+        },
+        "results": results,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float = 0.10, memory_threshold: float | None = None) -> list[str]:
+    """Return a description of every case that regressed beyond the thresholds.
+
+    A case regresses when its time grows by more than ``threshold`` (0.10 =
+    10%) over the baseline, or, if ``memory_threshold`` is given, when its
+    peak RSS grows by more than that fraction. Cases missing from either
+    side are ignored.
+    """
+    failures = []
+    for name, now in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        if now["seconds"] > before["seconds"] * (1 + threshold):
+            failures.append(f"{name}: {before['seconds']:.3f} s -> {now['seconds']:.3f} s")
+        if memory_threshold is not None and before.get("rss_peak") and now.get("rss_peak"):
+            if now["rss_peak"] > before["rss_peak"] * (1 + memory_threshold):
+                failures.append(f"{name}: peak RSS {before['rss_peak'] >> 20} MB -> {now['rss_peak'] >> 20} MB")
+    return failures
+
+
+def load_results(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_results(results: dict, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
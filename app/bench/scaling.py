@@ -0,0 +1,39 @@
+"""Scaling benchmark for pdf_tools.render_pages.
+
+Renders every page of a PDF with an increasing number of worker processes
+and prints throughput for each worker count.
+"""
+import os
+import time
+
+import fitz  # PyMuPDF
+
+try:
+    from .. import pdf_tools
+except ImportError:
+    import pdf_tools
+
+
+def default_worker_counts() -> list[int]:
+    cpus = os.cpu_count() or 1
+    return [n for n in (1, 2, 4, 8, 16, 32) if n <= cpus] or [1]
+
+
+def run(file_path: str, worker_counts: list[int], size: tuple[int, int] | None, progress=print) -> list[dict]:
+    """Render ``file_path`` once per worker count and return pages/s and speedup for each."""
+    with fitz.open(file_path) as pdf_document:
+        page_count = pdf_document.page_count
+
+    rows = []
+    baseline = None
+    progress(f"{page_count} pages, output size {size or 'native'}")
+    progress(f"{'workers':>8} {'seconds':>9} {'pages/s':>9} {'speedup':>8}")
+    for workers in worker_counts:
+        start = time.perf_counter()
+        for _ in pdf_tools.render_pages(file_path, size=size, workers=workers):
+            pass
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        rows.append({"workers": workers, "seconds": elapsed, "pages_per_s": page_count / elapsed, "speedup": baseline / elapsed})
+        progress(f"{workers:>8} {elapsed:>9.2f} {page_count / elapsed:>9.1f} {baseline / elapsed:>7.2f}x")
+    return rows
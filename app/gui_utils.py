@@ -1,43 +1,76 @@
 import tkinter as tk
-import fitz  # PyMuPDF to handle PDF operations
 from tkinter import filedialog, messagebox
 try:
     from . import pdf_tools
 except ImportError:
     import pdf_tools
 
-from PIL import Image
 import os
-import io
-
-# Global variable to hold the original PDF document
-pdf_document = None
-
-def upload_and_load_pdf(file_name_var, images, update_image, update_page_text, remove_button, save_button):
-    """Browse, upload and load a PDF file."""
-    global pdf_document
-    # Browse for a file
-    pdf_file_path = filedialog.askopenfilename(filetypes=[("PDF files", "*.pdf")])
-    if pdf_file_path:
-        file_name_var.set(pdf_file_path)
-        pdf_document = fitz.open(pdf_file_path)  # Open PDF
-        images.clear()  # Clear the existing images list
-        loaded_images = pdf_tools.load_pdf(pdf_file_path)
-        
-        if loaded_images:
-            images.extend(loaded_images)
+
+# Global variable to hold the session (shared handle) of the original PDF document
+pdf_session = None
+# Pending page edits, applied to the document in one pass when saving
+edit_journal = None
+
+def _open_document(pdf_file_path, images):
+    """Load a PDF into the preview and start a new edit journal for it (runs in a job)."""
+    global pdf_session, edit_journal
+    images.clear()  # Drop the previous document's pages
+    images.load(pdf_file_path)  # Pages are rendered on demand
+    if pdf_session is not None:
+        pdf_tools.sessions.release(pdf_session)
+    # Same handle the preview uses, so the file is parsed only once
+    pdf_session = pdf_tools.sessions.acquire(pdf_file_path)
+    edit_journal = pdf_tools.EditJournal(pdf_session.page_count)
+
+def upload_and_load_pdf(file_name_var, images, update_image, update_page_text, remove_button, save_button, scheduler, pdf_file_path=None, on_loaded=None):
+    """Browse for a PDF file (unless a path is given) and load it in a background job.
+
+    ``on_loaded(path)`` is called once the document's pages are available.
+    """
+    if not pdf_file_path:
+        pdf_file_path = filedialog.askopenfilename(filetypes=[("PDF files", "*.pdf")])
+    if not pdf_file_path:
+        return None
+    file_name_var.set(pdf_file_path)
+    remove_button.config(state="disabled")
+    save_button.config(state="disabled")
+
+    def load(job):
+        _open_document(pdf_file_path, images)
+        job.report(len(images), len(images))
+
+    def loaded(_):
+        if images:
             update_image(0)
             update_page_text(0, len(images))
             remove_button.config(state="normal")  # Ensure button is enabled here
             save_button.config(state="normal")    # Ensure button is enabled here
+            if on_loaded is not None:
+                on_loaded(pdf_file_path)
         else:
             messagebox.showerror("Error", "Failed to load PDF pages.")
-            remove_button.config(state="disabled")
-            save_button.config(state="disabled")
+
+    def failed(e):
+        update_image(None)
+        update_page_text(None, None)
+        messagebox.showerror("Error", f"Failed to load PDF: {e}")
+
+    return scheduler.submit(f"Loading {os.path.basename(pdf_file_path)}", load, on_done=loaded, on_error=failed)
 
 def upload_files(file_list_var):
-    """Allow the user to upload PDF, JPEG, and PNG files."""
-    file_paths = filedialog.askopenfilenames(filetypes=[("PDF files", "*.pdf"), ("JPEG files", "*.jpg;*.jpeg"), ("PNG files", "*.png")])
+    """Allow the user to upload PDF and image (JPEG, PNG, TIFF, WebP, BMP) files."""
+    file_paths = filedialog.askopenfilenames(
+        filetypes=[
+            ("PDF and image files", "*.pdf *.jpg *.jpeg *.png *.tif *.tiff *.webp *.bmp"),
+            ("PDF files", "*.pdf"),
+            ("JPEG files", "*.jpg *.jpeg"),
+            ("PNG files", "*.png"),
+            ("TIFF files", "*.tif *.tiff"),
+            ("WebP files", "*.webp"),
+            ("BMP files", "*.bmp"),
+        ]
+    )
     
     if file_paths:
         for file in file_paths:
@@ -53,108 +86,160 @@ def display_file_list(file_list_var, listbox):
 
 def remove_page(images, current_image_index, update_image, update_page_text, remove_button, save_button):
     """Remove the current page from the PDF and the image list."""
-    global pdf_document
-    if images and pdf_document:
+    if images and pdf_session:
         del images[current_image_index]  # Remove the image from the list
-        pdf_document.delete_page(current_image_index)  # Remove the page from the PDF
-        if current_image_index >= len(images):
-            current_image_index = len(images) - 1
-        if len(images) == 0:  # If no images are left
-            update_page_text(None, None)  # Clear the page text
-            update_image(None)  # Clear the image display
-            remove_button.config(state="disabled")
-            save_button.config(state="disabled")
-        else:
-            update_image(current_image_index)  # Show the new current image
-            update_page_text(current_image_index, len(images))
-
-def save_pdf():
-    """Save the modified PDF file."""
-    global pdf_document
-    if pdf_document:
-        save_path = filedialog.asksaveasfilename(defaultextension=".pdf", filetypes=[("PDF files", "*.pdf")])
-        if save_path:
-            try:
-                # Save the document to the new path (will overwrite any existing file at that path)
-                pdf_document.save(save_path)
-                messagebox.showinfo("Success", f"PDF saved successfully as {save_path}")
-                pdf_document.close()
-                pdf_document = None  # Reset the document
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to save PDF: {str(e)}")
-
-
-def merge_files(file_list_var, file_listbox):
-    """Merge uploaded files (PDFs and images) into a single PDF, ensuring images match the page size while maintaining aspect ratio."""
+        edit_journal.remove(current_image_index)  # Record the removal; applied on save
+        _show_after_removal(images, current_image_index, update_image, update_page_text, remove_button, save_button)
+
+def remove_page_range(page_range, images, current_image_index, update_image, update_page_text, remove_button, save_button):
+    """Remove every page matched by a range expression such as "1-40,97,200-"."""
+    if images and pdf_session:
+        try:
+            indices = pdf_tools.parse_page_ranges(page_range, len(images))
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+        remove_pages(indices, images, current_image_index, update_image, update_page_text, remove_button, save_button)
+
+def remove_pages(indices, images, current_image_index, update_image, update_page_text, remove_button, save_button):
+    """Remove the pages at the given indices (e.g. a thumbnail selection) in one step."""
+    if images and pdf_session and indices:
+        images.delete_pages(indices)
+        edit_journal.remove(indices)
+        # Stay on the same page if it survived, otherwise on the page that took its place
+        current_image_index -= sum(1 for index in indices if index < current_image_index)
+        _show_after_removal(images, current_image_index, update_image, update_page_text, remove_button, save_button)
+
+def remove_blank_and_duplicate_pages(images, get_current_index, update_image, update_page_text, remove_button, save_button, scheduler):
+    """Find blank and near-duplicate pages in a background job, then offer to remove them all at once."""
+    if not (images and pdf_session):
+        return None
+    file_path = pdf_session.file_path
+
+    def analyze(job):
+        return pdf_tools.analyze_pages(file_path, progress=job.report)
+
+    def analyzed(analysis):
+        if pdf_session is None or pdf_session.file_path != file_path:
+            return  # Another document was opened meanwhile
+        # The analysis numbers pages as in the file; map them to what is still shown,
+        # and keep a duplicate whose original has already been removed
+        shown = set(edit_journal.order)
+        flagged = set(analysis.blank) | {page for page, original in analysis.duplicates.items() if original in shown}
+        indices = [index for index, page in enumerate(edit_journal.order) if page in flagged]
+        if not indices:
+            messagebox.showinfo("Cleanup", "No blank or duplicate pages found.")
+            return
+        pages = ", ".join(str(index + 1) for index in indices[:30]) + (", …" if len(indices) > 30 else "")
+        if not messagebox.askyesno("Cleanup", f"Found {analysis.summary()}.\nRemove {len(indices)} page(s): {pages}?"):
+            return
+        remove_pages(indices, images, get_current_index(), update_image, update_page_text, remove_button, save_button)
+
+    def failed(e):
+        messagebox.showerror("Error", f"Page analysis failed: {e}")
+
+    return scheduler.submit("Analysing pages", analyze, on_done=analyzed, on_error=failed)
+
+def _show_after_removal(images, current_image_index, update_image, update_page_text, remove_button, save_button):
+    """Refresh the preview and buttons after pages were removed."""
+    if current_image_index >= len(images):
+        current_image_index = len(images) - 1
+    if len(images) == 0:  # If no images are left
+        update_page_text(None, None)  # Clear the page text
+        update_image(None)  # Clear the image display
+        remove_button.config(state="disabled")
+        save_button.config(state="disabled")
+    else:
+        update_image(current_image_index)  # Show the new current image
+        update_page_text(current_image_index, len(images))
+
+def save_pdf(file_name_var, images, update_image, update_page_text, scheduler, profile=pdf_tools.DEFAULT_SAVE_PROFILE, on_loaded=None):
+    """Ask where to save the modified PDF file, write it in a background job and show the saved file.
+
+    ``file_name_var`` is set to the saved file's path, and ``on_loaded(path)``
+    is called, once the saved file has replaced the open document.
+    """
+    if not pdf_session:
+        return None
+    save_path = filedialog.asksaveasfilename(defaultextension=".pdf", filetypes=[("PDF files", "*.pdf")])
+    if not save_path:
+        return None
+
+    def save(job):
+        # Apply the recorded edits in one pass to a handle of our own, so the shared
+        # one still matches the file if the write fails. Saving over the source file
+        # appends the changes instead of rewriting it.
+        with pdf_tools.open_document(pdf_session.file_path) as pdf_document:
+            report = edit_journal.save(pdf_document, save_path, profile=profile)
+        # Continue from the saved file, parsed afresh even if it was the source
+        pdf_tools.sessions.invalidate(save_path)
+        _open_document(save_path, images)
+        return report
+
+    def saved(report):
+        file_name_var.set(save_path)
+        update_image(0)
+        update_page_text(0, len(images))
+        if on_loaded is not None:
+            on_loaded(save_path)
+        messagebox.showinfo("Success", f"PDF saved successfully as {save_path}\n{report.summary()}")
+
+    def failed(e):
+        messagebox.showerror("Error", f"Failed to save PDF: {str(e)}")
+
+    return scheduler.submit("Saving", save, on_done=saved, on_error=failed)
+
+
+def merge_files(file_list_var, file_listbox, scheduler, profile=pdf_tools.DEFAULT_SAVE_PROFILE):
+    """Ask where to save, then merge the queued files (PDFs and images) into a single PDF in a background job."""
     if not file_list_var:
         messagebox.showerror("Error", "No files selected for merging.")
-        return
+        return None
 
     save_path = filedialog.asksaveasfilename(defaultextension=".pdf", filetypes=[("PDF files", "*.pdf")])
     if not save_path:
-        return
-
-    # Create a new PDF document using PyMuPDF
-    merger = fitz.open()
-
-    # Variables to store the reference width and height (based on the first PDF page)
-    reference_width, reference_height = None, None
-
-    for file in file_list_var:
-        file_ext = file.lower().split('.')[-1]
-        
-        if file_ext == "pdf":
-            # Append PDF pages
-            with fitz.open(file) as pdf_doc:
-                if reference_width is None or reference_height is None:
-                    first_page = pdf_doc[0]
-                    reference_width, reference_height = first_page.rect.width, first_page.rect.height
-                merger.insert_pdf(pdf_doc)
-        elif file_ext in ["jpg", "jpeg", "png"]:
-            # Convert images to PDFs
-            img = Image.open(file)
-            img = img.convert("RGB")  # Ensure the image is in RGB format
-
-            # If we have no reference width/height, use standard letter size (612x792 points)
-            if reference_width is None or reference_height is None:
-                reference_width, reference_height = 612, 792  # Default letter size in points (8.5 x 11 inches)
-
-            # Get the original image size
-            img_width, img_height = img.size
-
-            # Calculate the aspect ratio of the image
-            img_aspect = img_width / img_height
-            page_aspect = reference_width / reference_height
-
-            # Resize while maintaining aspect ratio
-            if img_aspect > page_aspect:
-                # Image is wider than the page, scale based on width
-                new_width = int(reference_width)
-                new_height = int(reference_width / img_aspect)
-            else:
-                # Image is taller than the page, scale based on height
-                new_height = int(reference_height)
-                new_width = int(reference_height * img_aspect)
-
-            # Resize the image with maintained aspect ratio
-            img = img.resize((new_width, new_height), Image.LANCZOS)
-
-            # Create a new blank image with the reference size and paste the resized image onto it (centered)
-            new_img = Image.new("RGB", (int(reference_width), int(reference_height)), color="white")
-            new_img.paste(img, ((int(reference_width) - new_width) // 2, (int(reference_height) - new_height) // 2))
-
-            # Save the image as a PDF in memory
-            img_pdf_bytes = io.BytesIO()
-            new_img.save(img_pdf_bytes, format="PDF")  # Save as PDF into memory
-            img_pdf_bytes.seek(0)  # Rewind to the beginning of the in-memory file
-            
-            # Load the PDF from memory and insert it into the merger
-            merger.insert_pdf(fitz.open(stream=img_pdf_bytes.read(), filetype="pdf"))
-
-    # Save the merged PDF
-    merger.save(save_path)
-    merger.close()
-    messagebox.showinfo("Success", f"Merged PDF saved as {save_path}")
-    file_list_var.clear()  # Clear the file list after merging
-    # clear the file_listbox
-    file_listbox.delete(0, tk.END)
\ No newline at end of file
+        return None
+
+    inputs = list(file_list_var)  # The queue may change while the job runs
+
+    def merge(job):
+        # Images are placed at native resolution on pages sized like the first PDF
+        return pdf_tools.merge_inputs(inputs, save_path, progress=job.report, profile=profile)
+
+    def merged(report):
+        messagebox.showinfo("Success", f"Merged PDF saved as {save_path}\n{report.summary()}")
+        file_list_var.clear()  # Clear the file list after merging
+        # clear the file_listbox
+        file_listbox.delete(0, tk.END)
+
+    def failed(e):
+        messagebox.showerror("Error", f"Merge failed: {e}")
+
+    return scheduler.submit("Merging", merge, on_done=merged, on_error=failed, unit="files")
+
+def split_pdf(source_path, rule, value, scheduler, profile=pdf_tools.DEFAULT_SAVE_PROFILE):
+    """Ask for an output folder, then split the PDF at ``source_path`` by ``rule`` in a background job."""
+    if not source_path or not os.path.isfile(source_path):
+        messagebox.showerror("Error", "Choose a PDF file to split.")
+        return None
+
+    output_dir = filedialog.askdirectory(initialdir=os.path.dirname(source_path), title="Folder for the split files")
+    if not output_dir:
+        return None
+
+    def split(job):
+        parts = pdf_tools.plan_split(source_path, rule, value, output_dir)
+        job.report(0, len(parts))
+        return pdf_tools.split_pdf(source_path, parts, profile=profile, progress=job.report)
+
+    def done(reports):
+        pages = sum(report.page_count for report in reports)
+        size = sum(report.size for report in reports)
+        messagebox.showinfo(
+            "Success", f"Wrote {len(reports)} file(s) to {output_dir}\n{pages} pages, {size / 1_048_576:.1f} MB in total"
+        )
+
+    def failed(e):
+        messagebox.showerror("Error", f"Split failed: {e}")
+
+    return scheduler.submit("Splitting", split, on_done=done, on_error=failed, unit="parts")
@@ -0,0 +1,186 @@
+import itertools
+import queue
+import threading
+import time
+
+
+class JobCancelled(Exception):
+    """Raised inside a job's worker thread once the job has been cancelled."""
+
+
+class Job:
+    """A unit of background work submitted to a JobScheduler.
+
+    The job function receives the Job itself and reports progress through
+    ``report(done, total)``, which also raises JobCancelled once ``cancel()``
+    has been called; long loops can call ``check_cancelled()`` directly.
+    ``post(callback, *args)`` hands partial results to the Tk thread.
+    Callbacks always run on the Tk thread.
+    """
+
+    def __init__(self, name, func, on_done=None, on_error=None, unit="pages", priority=1):
+        self.name = name
+        self.func = func
+        self.on_done = on_done
+        self.on_error = on_error
+        self.unit = unit
+        self.priority = priority
+        self.done = 0
+        self.total = None
+        self.started = None
+        self.finished = False
+        self._cancel = threading.Event()
+        self._scheduler = None
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def check_cancelled(self) -> None:
+        if self._cancel.is_set():
+            raise JobCancelled(self.name)
+
+    def post(self, callback, *args) -> None:
+        """Run ``callback(*args)`` on the Tk thread, e.g. to show a partial result."""
+        self._scheduler._events.put(("call", self, (callback, args)))
+
+    def report(self, done: int, total: int | None = None) -> None:
+        """Record progress (callable from the worker thread) and honour cancellation."""
+        self.done = done
+        self.total = total
+        self._scheduler._events.put(("progress", self, None))
+        self.check_cancelled()
+
+    @property
+    def rate(self) -> float | None:
+        """Units processed per second so far."""
+        if not self.started or not self.done:
+            return None
+        elapsed = time.perf_counter() - self.started
+        return self.done / elapsed if elapsed > 0 else None
+
+    @property
+    def eta(self) -> float | None:
+        """Estimated seconds until the job completes."""
+        rate = self.rate
+        if rate is None or self.total is None:
+            return None
+        return max(0.0, (self.total - self.done) / rate)
+
+    def status_text(self) -> str:
+        text = f"{self.name}…"
+        if self.total:
+            text += f" {self.done}/{self.total} {self.unit}"
+        if self.rate is not None:
+            text += f", {self.rate:.1f} {self.unit}/s"
+        if self.eta is not None:
+            text += f", ETA {self.eta:.0f} s"
+        return text
+
+
+class JobScheduler:
+    """Runs Jobs on a fixed pool of worker threads and reports back on the Tk thread.
+
+    At most ``max_workers`` jobs run at once; others wait in a queue ordered
+    by priority (lower first), then submission order. Workers post results
+    and progress to a thread-safe queue that is drained with ``root.after``,
+    so callbacks and ``on_status`` never run off the Tk thread.
+    ``on_status(job)`` is called whenever a job's progress changes or it
+    finishes (after ``job.finished`` is set).
+    """
+
+    def __init__(self, root, max_workers: int = 1, poll_ms: int = 50, on_status=None):
+        self.root = root
+        self.poll_ms = poll_ms
+        self.on_status = on_status
+        self.active: list[Job] = []
+        self._jobs = queue.PriorityQueue()
+        self._events = queue.Queue()
+        self._order = itertools.count()
+        self._closed = False
+        self._workers = [threading.Thread(target=self._work, daemon=True) for _ in range(max_workers)]
+        for worker in self._workers:
+            worker.start()
+        self._poll = self.root.after(self.poll_ms, self._drain)
+
+    def submit(self, name, func, on_done=None, on_error=None, unit="pages", priority=1) -> Job:
+        """Queue ``func(job)`` to run in the background and return its Job."""
+        job = Job(name, func, on_done, on_error, unit, priority)
+        job._scheduler = self
+        self.active.append(job)
+        self._jobs.put((priority, next(self._order), job))
+        return job
+
+    def cancel_all(self) -> None:
+        for job in self.active:
+            job.cancel()
+
+    def shutdown(self) -> None:
+        """Cancel outstanding jobs and stop the worker threads."""
+        self._closed = True
+        self.cancel_all()
+        for _ in self._workers:
+            self._jobs.put((float("inf"), next(self._order), None))
+        try:
+            self.root.after_cancel(self._poll)
+        except Exception:
+            pass
+
+    def _work(self) -> None:
+        while True:
+            _, _, job = self._jobs.get()
+            if job is None:
+                return
+            if job.cancelled:
+                self._events.put(("cancelled", job, None))
+                continue
+            job.started = time.perf_counter()
+            try:
+                result = job.func(job)
+            except JobCancelled:
+                self._events.put(("cancelled", job, None))
+            except Exception as e:
+                self._events.put(("error", job, e))
+            else:
+                self._events.put(("done", job, result))
+
+    def _drain(self) -> None:
+        changed = set()
+        try:
+            while True:
+                kind, job, value = self._events.get_nowait()
+                if kind == "progress":
+                    changed.add(job)
+                    continue
+                if kind == "call":
+                    callback, args = value
+                    try:
+                        callback(*args)
+                    except Exception as e:
+                        print(f"Error handling update from {job.name}: {e}")
+                    continue
+                job.finished = True
+                if job in self.active:
+                    self.active.remove(job)
+                changed.add(job)
+                try:
+                    if kind == "done" and job.on_done is not None:
+                        job.on_done(value)
+                    elif kind == "error":
+                        if job.on_error is not None:
+                            job.on_error(value)
+                        else:
+                            print(f"Error in {job.name}: {value}")
+                except Exception as e:
+                    print(f"Error handling result of {job.name}: {e}")
+        except queue.Empty:
+            pass
+
+        if self.on_status is not None:
+            for job in changed:
+                self.on_status(job)
+        if not self._closed:
+            self._poll = self.root.after(self.poll_ms, self._drain)
@@ -8,11 +8,18 @@ if getattr(sys, "frozen", False):  # running from PyInstaller bundle
         sys.stderr = open(os.devnull, "w")
 # ----------------------------------------------------------------------
 
+# Startup timing starts here, so the report covers all imports below
+try:
+    from . import startup
+except ImportError:
+    import startup
+startup.timer.watch_imports()
+
 # robust imports: work in package mode and in frozen script mode
 try:
-    from . import gui_utils, pdf_tools
+    from . import gui_utils, jobs, metrics, page_cache, pdf_tools, thumbnails
 except ImportError:
-    import gui_utils, pdf_tools
+    import gui_utils, jobs, metrics, page_cache, pdf_tools, thumbnails
 
 import threading
 import tkinter as tk
@@ -22,6 +29,10 @@ from PIL import Image, ImageTk, ImageOps
 import ttkbootstrap as tb
 from ttkbootstrap.constants import *
 
+# PyMuPDF and NumPy are not imported yet: they load in the background once the
+# window is shown (see _after_first_paint), or on first use
+startup.timer.mark("imports done")
+
 # IMPORTANT: app package structure should be:
 # app/
 #   __init__.py
@@ -36,13 +47,16 @@ class TreeListboxShim:
     Small adapter so we can pass a ttk.Treeview to functions that expect
     a Tk Listbox with .delete(0, END). We just clear all rows.
     """
-    def __init__(self, tree: tb.Treeview):
+    def __init__(self, tree: tb.Treeview, on_clear=None):
         self.tree = tree
+        self.on_clear = on_clear
 
     def delete(self, start=None, end=None):
         # Clear all items in the tree
         for item in self.tree.get_children():
             self.tree.delete(item)
+        if self.on_clear is not None:
+            self.on_clear()
 
 
 class PDFToolkitApp(tb.Window):
@@ -61,12 +75,57 @@ class PDFToolkitApp(tb.Window):
             pass
 
         # App state
-        self.images: list[Image.Image] = []
+        self.images = pdf_tools.PageSequence()  # lazily rendered pages; disk cache attached after first paint
         self.current_image_index: int = 0
         self.file_list: list[str] = []  # merge queue
+        self.save_profile_var = tk.StringVar(value=pdf_tools.DEFAULT_SAVE_PROFILE)  # see pdf_tools.SAVE_PROFILES
+        self._render_job = None  # latest preview render request
+        self.text_index: pdf_tools.TextIndex | None = None  # words on each page of the open document
+        self._index_job = None
+        self._search_after = None  # pending type-ahead search
+        metrics.add_sink(metrics.histograms)  # live throughput for the status bar
+
+        # Background work (load, render, merge, save). PyMuPDF must not be used from
+        # several threads at once, so document jobs run one at a time.
+        self.jobs = jobs.JobScheduler(self, max_workers=1, on_status=self._show_job_status)
+        # Merge-queue preflight probes files in worker processes, so its jobs only wait on
+        # them and can run beside document jobs without blocking behind a long merge
+        self.preflight = pdf_tools.Preflight()
+        self.probe_jobs = jobs.JobScheduler(self, max_workers=2)
 
         self._build_ui()
         self._bind_shortcuts()
+        startup.timer.mark("window built")
+        self._painted = False
+        self.bind("<Expose>", self._on_expose, add="+")
+
+    def _on_expose(self, event):
+        # Widgets redraw in idle callbacks queued by the first Expose, so run after those
+        if not self._painted:
+            self._painted = True
+            self.after_idle(self._after_first_paint)
+
+    def _after_first_paint(self):
+        startup.timer.mark("first paint")
+        startup.timer.stop_watching()
+        self.images.disk_cache = self._open_page_cache()
+        threading.Thread(target=self._preload, daemon=True).start()
+
+    @staticmethod
+    def _preload():
+        """Import the heavy libraries while the user looks at the window, then report startup timing."""
+        pdf_tools.preload()
+        startup.timer.mark("libraries loaded")
+        startup.write_report(startup.timer)
+
+    @staticmethod
+    def _open_page_cache():
+        # The on-disk cache only speeds up reopening files; run without it if it can't be opened
+        try:
+            return page_cache.PageCache()
+        except Exception as e:
+            print(f"Page cache disabled: {e}")
+            return None
 
     # ----------------------- UI BUILD -----------------------
 
@@ -77,6 +136,11 @@ class PDFToolkitApp(tb.Window):
         filemenu.add_command(label="Open PDF…", accelerator="Ctrl+O", command=self.open_pdf)
         filemenu.add_command(label="Save As…", accelerator="Ctrl+S", command=self.save_pdf)
         filemenu.add_separator()
+        profilemenu = tb.Menu(filemenu, tearoff=0)
+        for profile in pdf_tools.SAVE_PROFILES:
+            profilemenu.add_radiobutton(label=profile.capitalize(), value=profile, variable=self.save_profile_var)
+        filemenu.add_cascade(label="Save Profile", menu=profilemenu)
+        filemenu.add_separator()
         filemenu.add_command(label="Quit", accelerator="Ctrl+Q", command=self.destroy)
         menubar.add_cascade(label="File", menu=filemenu)
         self.config(menu=menubar)
@@ -85,7 +149,7 @@ class PDFToolkitApp(tb.Window):
         paned = tb.PanedWindow(self, orient="horizontal")
         paned.pack(fill="both", expand=True, padx=10, pady=10)
 
-        # Left: tabs (Remove Pages / Merge Files)
+        # Left: tabs (Remove Pages / Merge Files / Split PDF)
         left = tb.Frame(paned)
         paned.add(left, weight=1)
 
@@ -94,8 +158,10 @@ class PDFToolkitApp(tb.Window):
 
         self.remove_tab = tb.Frame(tabs)
         self.merge_tab = tb.Frame(tabs)
+        self.split_tab = tb.Frame(tabs)
         tabs.add(self.remove_tab, text="Remove Pages")
         tabs.add(self.merge_tab, text="Merge Files")
+        tabs.add(self.split_tab, text="Split PDF")
 
         # Right: live preview
         right = tb.Frame(paned)
@@ -115,6 +181,8 @@ class PDFToolkitApp(tb.Window):
                 self.update_page_text,
                 self.remove_btn,
                 self.save_btn,
+                self.jobs,
+                on_loaded=self._index_text,
             ),
         ).pack(pady=4)
 
@@ -132,6 +200,18 @@ class PDFToolkitApp(tb.Window):
             command=lambda: self.update_image(min(len(self.images) - 1, self.current_image_index + 1)),
         ).grid(row=0, column=2, padx=4)
 
+        # Full-text search: type to jump to the first match, Enter for the next one
+        search = tb.Frame(self.remove_tab)
+        search.pack(pady=4, padx=8, fill="x")
+        tb.Label(search, text="Find:").pack(side="left", padx=(0, 6))
+        self.search_var = tk.StringVar()
+        search_entry = tb.Entry(search, textvariable=self.search_var)
+        search_entry.pack(side="left", fill="x", expand=True)
+        search_entry.bind("<KeyRelease>", self._on_search_key)
+        search_entry.bind("<Return>", lambda e: self._search_text(step=True))
+        self.search_status_var = tk.StringVar()
+        tb.Label(self.remove_tab, textvariable=self.search_status_var).pack()
+
         self.remove_btn = tb.Button(
             self.remove_tab,
             text="Remove Page",
@@ -147,21 +227,74 @@ class PDFToolkitApp(tb.Window):
         )
         self.remove_btn.pack(pady=6)
 
+        # Bulk removal by range expression, e.g. "1-40,97,200-"
+        ranges = tb.Frame(self.remove_tab)
+        ranges.pack(pady=4, padx=8, fill="x")
+        self.page_range_var = tk.StringVar()
+        tb.Entry(ranges, textvariable=self.page_range_var).pack(side="left", fill="x", expand=True)
+        tb.Button(
+            ranges,
+            text="Remove Pages",
+            command=lambda: gui_utils.remove_page_range(
+                self.page_range_var.get(),
+                self.images,
+                self.current_image_index,
+                self.update_image,
+                self.update_page_text,
+                self.remove_btn,
+                self.save_btn,
+            ),
+        ).pack(side="left", padx=(6, 0))
+
+        # Bulk cleanup of blank separator sheets and double-fed pages
+        tb.Button(
+            self.remove_tab,
+            text="Remove Blank/Duplicate Pages",
+            bootstyle="secondary",
+            command=lambda: gui_utils.remove_blank_and_duplicate_pages(
+                self.images,
+                lambda: self.current_image_index,
+                self.update_image,
+                self.update_page_text,
+                self.remove_btn,
+                self.save_btn,
+                self.jobs,
+            ),
+        ).pack(pady=4)
+
+        # Pages selected in the thumbnail strip (Ctrl/Shift-click for several)
+        tb.Button(self.remove_tab, text="Remove Selected Pages", command=self._remove_selected_pages).pack(pady=4)
+
         self.save_btn = tb.Button(self.remove_tab, text="Save", state="disabled", command=self.save_pdf)
         self.save_btn.pack(pady=6)
 
+        # Thumbnails of the whole document beside the preview; only visible rows are rendered
+        self.thumbs = thumbnails.ThumbnailStrip(right, self.images, self.jobs, on_activate=self.show_page)
+        self.thumbs.pack(side="left", fill="y")
+        self.thumbs.canvas.bind("<Delete>", lambda e: self._remove_selected_pages())
+
         # Preview area
         self.preview = tb.Label(right)
         self.preview.pack(expand=True)
 
         # ---------------- Merge Files tab (Treeview) ----------------
-        tb.Label(self.merge_tab, text="Select PDFs / JPG / PNG to merge:").pack(pady=8)
+        tb.Label(self.merge_tab, text="Select PDFs / images (JPG, PNG, TIFF, WebP, BMP) to merge:").pack(pady=8)
 
-        self.tree = tb.Treeview(self.merge_tab, columns=("name", "type"), show="headings", height=12, bootstyle="info")
+        columns = ("name", "type", "pages", "dimensions", "estimate", "status")
+        self.tree = tb.Treeview(self.merge_tab, columns=columns, show="headings", height=12, bootstyle="info")
         self.tree.heading("name", text="File")
         self.tree.heading("type", text="Type")
-        self.tree.column("name", width=520, anchor="w")
-        self.tree.column("type", width=80, anchor="center")
+        self.tree.heading("pages", text="Pages")
+        self.tree.heading("dimensions", text="Size")
+        self.tree.heading("estimate", text="Est. output")
+        self.tree.heading("status", text="Status")
+        self.tree.column("name", width=260, anchor="w")
+        self.tree.column("type", width=50, anchor="center")
+        self.tree.column("pages", width=50, anchor="center")
+        self.tree.column("dimensions", width=110, anchor="center")
+        self.tree.column("estimate", width=80, anchor="e")
+        self.tree.column("status", width=130, anchor="w")
+        self.tree.tag_configure("bad", foreground="red")
         self.tree.pack(padx=8, pady=4, fill="both", expand=True)
 
         scroll = tb.Scrollbar(self.merge_tab, orient="vertical", command=self.tree.yview)
@@ -172,11 +305,48 @@ class PDFToolkitApp(tb.Window):
         btns.pack(pady=6)
         tb.Button(btns, text="+", command=self.add_files).grid(row=0, column=0, padx=5)
         tb.Button(btns, text="-", command=self._remove_tree_selected).grid(row=0, column=1, padx=5)
-        tb.Button(self.merge_tab, text="Merge Files", command=self._merge_files_threaded).pack(pady=6)
-
-        # Status bar
-        self.status = tb.Label(self, text="Ready", anchor="w", bootstyle="inverse")
-        self.status.pack(fill="x")
+        self.estimate_var = tk.StringVar(value="")
+        tb.Label(self.merge_tab, textvariable=self.estimate_var).pack()
+        tb.Button(self.merge_tab, text="Merge Files", command=self._merge_files).pack(pady=6)
+
+        # ---------------- Split PDF tab ----------------
+        tb.Label(self.split_tab, text="Split a PDF into several files:").pack(pady=8)
+        source = tb.Frame(self.split_tab)
+        source.pack(pady=4, padx=8, fill="x")
+        self.split_source_var = tk.StringVar()
+        tb.Entry(source, textvariable=self.split_source_var).pack(side="left", fill="x", expand=True)
+        tb.Button(source, text="Browse", command=self._choose_split_source).pack(side="left", padx=(6, 0))
+
+        self.split_rule_var = tk.StringVar(value="pages")
+        self.split_value_var = tk.StringVar(value="10")
+        rules = tb.Frame(self.split_tab)
+        rules.pack(pady=4, padx=8, fill="x")
+        for rule, label, default in (
+            ("pages", "Every N pages", "10"),
+            ("ranges", "Page ranges, one file per ';' (e.g. 1-10; 11-40)", ""),
+            ("bookmarks", "At bookmarks down to outline level", "1"),
+        ):
+            tb.Radiobutton(
+                rules,
+                text=label,
+                value=rule,
+                variable=self.split_rule_var,
+                command=lambda default=default: self.split_value_var.set(default),
+            ).pack(anchor="w", pady=2)
+        tb.Entry(self.split_tab, textvariable=self.split_value_var).pack(pady=4, padx=8, fill="x")
+        tb.Button(self.split_tab, text="Split…", command=self._split_pdf).pack(pady=6)
+
+        # Status bar with progress of background jobs
+        statusbar = tb.Frame(self)
+        statusbar.pack(fill="x")
+        self.status = tb.Label(statusbar, text="Ready", anchor="w", bootstyle="inverse")
+        self.status.pack(side="left", fill="x", expand=True)
+        self.cancel_btn = tb.Button(
+            statusbar, text="Cancel", bootstyle="secondary", state="disabled", command=self.jobs.cancel_all
+        )
+        self.cancel_btn.pack(side="right")
+        self.progress = tb.Progressbar(statusbar, length=160, mode="determinate", bootstyle="info")
+        self.progress.pack(side="right", padx=6)
 
         # Initialize preview
         self.update_image(None)
@@ -193,27 +363,94 @@ class PDFToolkitApp(tb.Window):
         path = filedialog.askopenfilename(filetypes=[("PDF files", "*.pdf")])
         if not path:
             return
-        self.file_name_var.set(path)
         gui_utils.upload_and_load_pdf(
-            self.file_name_var, self.images, self.update_image, self.update_page_text, self.remove_btn, self.save_btn
+            self.file_name_var,
+            self.images,
+            self.update_image,
+            self.update_page_text,
+            self.remove_btn,
+            self.save_btn,
+            self.jobs,
+            pdf_file_path=path,
+            on_loaded=self._index_text,
         )
-        self._set_status(f"Loaded: {os.path.basename(path)}")
 
     def save_pdf(self):
-        # Use gui_utils.save_pdf; it handles dialogs and messages
-        gui_utils.save_pdf()
-        self._set_status("Saved PDF")
+        # Use gui_utils.save_pdf; it handles dialogs and messages and saves in a job
+        gui_utils.save_pdf(
+            self.file_name_var,
+            self.images,
+            self.update_image,
+            self.update_page_text,
+            self.jobs,
+            self.save_profile_var.get(),
+            on_loaded=self._index_text,
+        )
+
+    def destroy(self):
+        self.jobs.shutdown()
+        self.probe_jobs.shutdown()
+        self.preflight.shutdown()
+        self.images.clear()
+        pdf_tools.sessions.close_all()
+        super().destroy()
 
     def add_files(self):
         if gui_utils.upload_files(self.file_list):
             # Add to the tree for display
-            for path in self.file_list[len(self.tree.get_children()) :]:
+            new_paths = self.file_list[len(self.tree.get_children()) :]
+            for path in new_paths:
                 self._tree_add(path)
             self._set_status(f"Added {len(self.file_list)} file(s) to merge queue")
+            self._probe_files(new_paths)
 
     def _tree_add(self, path: str):
         ext = os.path.splitext(path)[1].lower().replace(".", "")
-        self.tree.insert("", "end", values=(os.path.basename(path), ext))
+        self.tree.insert("", "end", values=(os.path.basename(path), ext, "", "", "", "Checking…"))
+
+    def _probe_files(self, paths):
+        """Preflight newly queued files in the background and fill in their rows as results arrive."""
+
+        def probe(job):
+            for done, result in enumerate(self.preflight.probe(paths), start=1):
+                job.post(self._show_probe, result)
+                job.report(done, len(paths))
+
+        self.probe_jobs.submit("Checking files", probe, unit="files")
+        self._update_estimate()
+
+    def _show_probe(self, result):
+        if result.ok:
+            if result.pixel_size:
+                dimensions = f"{result.pixel_size[0]}x{result.pixel_size[1]} px"
+            else:
+                dimensions = f"{result.page_size[0] / 72:.1f}x{result.page_size[1] / 72:.1f} in"
+            status = "Encrypted (opens)" if result.encrypted else "OK"
+            values = (result.page_count, dimensions, f"{result.estimated_size / 1_048_576:.1f} MB", status)
+        else:
+            values = ("", "", "", result.error)
+        tags = () if result.ok else ("bad",)
+        for item, path in zip(self.tree.get_children(), self.file_list):
+            if path == result.path:
+                name, ext = self.tree.item(item, "values")[:2]
+                self.tree.item(item, values=(name, ext) + values, tags=tags)
+        self._update_estimate()
+
+    def _update_estimate(self):
+        results = [self.preflight.cached(path) for path in self.file_list]
+        if not results:
+            self.estimate_var.set("")
+            return
+        checking = sum(1 for result in results if result is None)
+        failed = sum(1 for result in results if result is not None and not result.ok)
+        pages = sum(result.page_count for result in results if result is not None)
+        size = sum(result.estimated_size for result in results if result is not None)
+        text = f"Estimated output: {pages} pages, {size / 1_048_576:.1f} MB"
+        if checking:
+            text += f" (checking {checking} file(s)…)"
+        if failed:
+            text += f" — {failed} file(s) cannot be merged"
+        self.estimate_var.set(text)
 
     def _remove_tree_selected(self):
         # Remove selected rows from both tree and file_list (keep indices aligned)
@@ -222,44 +459,129 @@ class PDFToolkitApp(tb.Window):
             return
 
         # Compute indices and remove in reverse order to keep positions consistent
-        indices = sorted((self.tree.index(item) for item in selected), reverse=True)
-        for idx, item in zip(indices, selected):
+        rows = sorted(((self.tree.index(item), item) for item in selected), reverse=True)
+        for idx, item in rows:
             if 0 <= idx < len(self.file_list):
                 self.file_list.pop(idx)
             self.tree.delete(item)
 
         self._set_status("Removed selected file(s)")
+        self._update_estimate()
+
+    def _merge_files(self):
+        # Refuse inputs that already failed preflight instead of failing midway through the merge
+        bad = [result for result in map(self.preflight.cached, self.file_list) if result is not None and not result.ok]
+        if bad:
+            details = "\n".join(f"{os.path.basename(result.path)}: {result.error}" for result in bad)
+            messagebox.showerror("Error", f"Remove these files before merging:\n{details}")
+            return
+        # The merge runs as a background job so the UI stays responsive on large jobs.
+        # Use a shim so gui_utils.merge_files can clear our Treeview after merging
+        shim = TreeListboxShim(self.tree, on_clear=self._update_estimate)
+        gui_utils.merge_files(self.file_list, shim, self.jobs, self.save_profile_var.get())
 
-    def _merge_files_threaded(self):
-        # Put merge in a thread to avoid blocking the UI on large jobs
-        self._set_status("Merging…")
-        self.configure(cursor="watch")
-        t = threading.Thread(target=self._merge_files_safe, daemon=True)
-        t.start()
+    def _choose_split_source(self):
+        path = filedialog.askopenfilename(filetypes=[("PDF files", "*.pdf")])
+        if path:
+            self.split_source_var.set(path)
+
+    def _split_pdf(self):
+        # Default to the document open in the Remove Pages tab (as saved on disk)
+        source = self.split_source_var.get().strip() or self.file_name_var.get().strip()
+        gui_utils.split_pdf(
+            source, self.split_rule_var.get(), self.split_value_var.get().strip(), self.jobs, self.save_profile_var.get()
+        )
 
-    def _merge_files_safe(self):
-        try:
-            # Use a shim so gui_utils.merge_files can clear our Treeview after merging
-            shim = TreeListboxShim(self.tree)
-            gui_utils.merge_files(self.file_list, shim)  # clears file_list and tree via shim
-            self._set_status("Merge complete")
-        except Exception as e:
-            messagebox.showerror("Error", f"Merge failed: {e}")
-            self._set_status("Merge failed")
-        finally:
-            # reset cursor
-            self.after(0, lambda: self.configure(cursor=""))
+    def _index_text(self, path):
+        # Large documents are extracted in worker processes, so that job waits beside the
+        # document jobs, not behind them; small ones are read in-process, on the document thread
+        if self._index_job is not None:
+            self._index_job.cancel()
+        index = self.text_index = pdf_tools.TextIndex(len(self.images))  # no pages are removed yet
+        disk_cache = self.images.disk_cache
+
+        def build(job):
+            pdf_tools.build_text_index(path, index, disk_cache, progress=job.report)
+
+        def failed(e):
+            print(f"Error indexing text: {e}")
+
+        scheduler = self.jobs if index.page_count < pdf_tools.PARALLEL_INDEX_MIN_PAGES else self.probe_jobs
+        self._index_job = scheduler.submit("Indexing text", build, on_error=failed)
+
+    def _on_search_key(self, event):
+        if event.keysym == "Return":
+            return
+        if self._search_after is not None:
+            self.after_cancel(self._search_after)
+        self._search_after = self.after(150, self._search_text)
+
+    def _search_text(self, step: bool = False):
+        self._search_after = None
+        query = self.search_var.get()
+        index = self.text_index
+        if index is None or not query.strip():
+            self.search_status_var.set("")
+            return
+        # The index holds source pages; map them to positions left after removals
+        matches = self.images.view_indices(index.search(query))
+        note = "" if index.complete else f" (indexed {len(index)} of {index.page_count} pages so far)"
+        if not matches:
+            self.search_status_var.set("No matches" + note)
+            return
+        if step:
+            target = next((match for match in matches if match > self.current_image_index), matches[0])
+        else:
+            target = matches[0]
+        self.show_page(target)
+        self.search_status_var.set(f"Match {matches.index(target) + 1} of {len(matches)}" + note)
+
+    def _remove_selected_pages(self):
+        gui_utils.remove_pages(
+            self.thumbs.selected(),
+            self.images,
+            self.current_image_index,
+            self.update_image,
+            self.update_page_text,
+            self.remove_btn,
+            self.save_btn,
+        )
 
     # ----------------------- Preview helpers -----------------------
 
+    def show_page(self, index):
+        """Preview the page at ``index`` and update the "Page X of Y" label to match."""
+        self.update_image(index)
+        self.update_page_text(index, len(self.images))
+
     def update_image(self, index):
         """Update right-side preview with current image."""
         self.current_image_index = 0 if index is None else index
+        self.thumbs.see(index if self.images else None)
+        if self._render_job is not None:
+            self._render_job.cancel()  # a newer page was requested
+            self._render_job = None
 
-        target_w, target_h = 204, 264  # small letter-ish preview
-        if index is not None and self.images:
-            img = self.images[index].resize((target_w, target_h), Image.Resampling.LANCZOS)
-        else:
+        if index is None or not self.images:
+            self._show_preview(None)
+            return
+
+        # Pages already in memory or the disk cache are shown at once; others render in a job
+        img = self.images.cached(index, "preview")
+        if img is not None:
+            self._show_preview(img)
+            return
+        job = self.jobs.submit(
+            f"Rendering page {index + 1}",
+            lambda job: self.images.get(index, "preview"),
+            on_done=lambda img: job is self._render_job and self._show_preview(img),
+            priority=0,
+        )
+        self._render_job = job
+
+    def _show_preview(self, img):
+        target_w, target_h = pdf_tools.RENDER_TIERS["preview"]  # small letter-ish preview
+        if img is None:
             img = Image.new("RGB", (target_w, target_h), "white")
 
         img = ImageOps.expand(img, border=1, fill="black")
@@ -276,8 +598,30 @@ class PDFToolkitApp(tb.Window):
     def _set_status(self, text: str):
         self.status.configure(text=text)
 
+    def _show_job_status(self, job):
+        # Preview renders run at priority 0 and are too short to be worth reporting
+        if job.priority == 0:
+            return
+        if not job.finished:
+            throughput = metrics.histograms.throughput_text()
+            self._set_status(job.status_text() + (f" | {throughput}" if throughput else ""))
+            if job.total:
+                self.progress.configure(mode="determinate", value=100 * job.done / job.total)
+            self.cancel_btn.configure(state="normal")
+            return
+
+        self._set_status(f"{job.name} cancelled" if job.cancelled else f"{job.name} finished")
+        if not any(active.priority for active in self.jobs.active):
+            self.progress.configure(value=0)
+            self.cancel_btn.configure(state="disabled")
+
 
 if __name__ == "__main__":
+    # Lets the PyInstaller build start pdf_tools' render worker processes
+    if getattr(sys, "frozen", False):
+        import multiprocessing
+        multiprocessing.freeze_support()
+
     # Windows HiDPI scaling (no-op elsewhere)
     try:
         from ctypes import windll
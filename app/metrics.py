@@ -0,0 +1,358 @@
+"""Operation timing for pdf_tools: events, sinks and live throughput.
+
+pdf_tools wraps each operation (open, render, insert, image, save, and the
+merge or split around them) in ``measure(op, path)``. When the operation
+finishes, an ``Event`` with its duration and the bytes and pages it handled
+is passed to every registered sink (see ``add_sink``):
+
+* ``Histograms`` keeps per-operation counts, latency histograms and recent
+  throughput in memory; the GUI's status bar and the batch runner read the
+  module-level ``histograms``.
+* ``JsonLinesSink`` appends each event to a file as one JSON object per line.
+
+A cProfile of the measured operations can be captured as well. Set
+``PDF_TOOLKIT_METRICS=FILE`` to log events as JSON lines and
+``PDF_TOOLKIT_PROFILE=FILE`` to write a profile (view it with
+``python -m pstats FILE``). Both are read at import time, so worker
+processes log too; workers write their profile to ``FILE.<pid>`` when they
+exit. With no sink and no profiler, ``measure`` returns a shared no-op
+object.
+"""
+import atexit
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+
+METRICS_ENV = "PDF_TOOLKIT_METRICS"
+PROFILE_ENV = "PDF_TOOLKIT_PROFILE"
+_PARENT_PID_ENV = "PDF_TOOLKIT_PROFILE_PARENT"
+
+
+@dataclass
+class Event:
+    """One finished operation."""
+
+    op: str
+    seconds: float
+    nbytes: int = 0
+    pages: int = 0
+    ok: bool = True
+    error: str | None = None
+    path: str | None = None
+    time: float = 0.0  # wall-clock time it finished
+    pid: int = 0
+
+
+class _Measure:
+    """Times one operation; set ``nbytes`` and ``pages`` inside the ``with`` block."""
+
+    __slots__ = ("op", "path", "nbytes", "pages", "_start", "_profiling")
+
+    def __init__(self, op: str, path: str | None):
+        self.op = op
+        self.path = path
+        self.nbytes = 0
+        self.pages = 0
+
+    def __enter__(self):
+        self._profiling = _profiler is not None and _profiler.start()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self._start
+        if self._profiling:
+            _profiler.stop()
+        event = Event(
+            op=self.op,
+            seconds=seconds,
+            nbytes=self.nbytes,
+            pages=self.pages,
+            ok=exc_type is None,
+            error=None if exc is None else str(exc) or exc_type.__name__,
+            path=self.path,
+            time=time.time(),
+            pid=os.getpid(),
+        )
+        for sink in tuple(_sinks):
+            try:
+                sink.record(event)
+            except Exception as e:
+                print(f"Error recording {self.op} event: {e}")
+        return False
+
+
+class _NullMeasure:
+    """Stands in for ``_Measure`` while nothing is listening."""
+
+    nbytes = 0
+    pages = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+
+_NULL = _NullMeasure()
+_sinks: list = []
+_profiler = None
+
+
+def measure(op: str, path: str | None = None):
+    """Context manager timing operation ``op``; failures are recorded and re-raised."""
+    if not _sinks and _profiler is None:
+        return _NULL
+    return _Measure(op, path)
+
+
+def add_sink(sink) -> None:
+    """Send every event to ``sink.record(event)`` from now on."""
+    if sink not in _sinks:
+        _sinks.append(sink)
+
+
+def remove_sink(sink) -> None:
+    if sink in _sinks:
+        _sinks.remove(sink)
+
+
+class _OpStats:
+    __slots__ = ("count", "errors", "seconds", "nbytes", "pages", "max", "buckets")
+
+    def __init__(self):
+        self.count = self.errors = self.nbytes = self.pages = 0
+        self.seconds = self.max = 0.0
+        self.buckets: dict[int, int] = {}  # binary exponent of the duration -> count
+
+    def percentile(self, fraction: float) -> float:
+        """Upper bound of the bucket holding the given fraction of durations."""
+        wanted = fraction * self.count
+        seen = 0
+        for exponent in sorted(self.buckets):
+            seen += self.buckets[exponent]
+            if seen >= wanted:
+                return min(2.0**exponent, self.max)
+        return self.max
+
+
+class Histograms:
+    """In-memory sink: per-operation totals and latency histograms, plus recent throughput.
+
+    Durations are counted in power-of-two buckets, so percentiles are
+    accurate to within a factor of two. The last ``recent`` events are kept
+    for ``throughput()``.
+    """
+
+    def __init__(self, recent: int = 4096):
+        self._ops: dict[str, _OpStats] = {}
+        self._recent: deque[tuple[float, str, int, int]] = deque(maxlen=recent)  # (end, op, bytes, pages)
+        self._lock = threading.Lock()
+
+    def record(self, event: Event) -> None:
+        with self._lock:
+            stats = self._ops.get(event.op)
+            if stats is None:
+                stats = self._ops[event.op] = _OpStats()
+            stats.count += 1
+            stats.errors += not event.ok
+            stats.seconds += event.seconds
+            stats.nbytes += event.nbytes
+            stats.pages += event.pages
+            stats.max = max(stats.max, event.seconds)
+            exponent = math.frexp(event.seconds)[1] if event.seconds > 0 else -64
+            stats.buckets[exponent] = stats.buckets.get(exponent, 0) + 1
+            self._recent.append((time.perf_counter(), event.op, event.nbytes, event.pages))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._ops.clear()
+            self._recent.clear()
+
+    def throughput(self, window: float = 5.0) -> dict[str, tuple[float, float]]:
+        """Return ``{op: (bytes per second, pages per second)}`` over the last ``window`` seconds."""
+        since = time.perf_counter() - window
+        totals: dict[str, list[int]] = {}
+        with self._lock:
+            for end, op, nbytes, pages in reversed(self._recent):
+                if end < since:
+                    break
+                total = totals.setdefault(op, [0, 0])
+                total[0] += nbytes
+                total[1] += pages
+        return {op: (nbytes / window, pages / window) for op, (nbytes, pages) in totals.items()}
+
+    def throughput_text(self, window: float = 5.0, ops=("render", "insert", "image", "save")) -> str:
+        """One line like ``render 31 pages/s, save 42.0 MB/s`` for recently active operations."""
+        parts = []
+        for op, (nbytes, pages) in self.throughput(window).items():
+            if op not in ops:
+                continue
+            if op == "render" or not nbytes:
+                parts.append(f"{op} {pages:.0f} pages/s")
+            else:
+                parts.append(f"{op} {nbytes / 1_048_576:.1f} MB/s")
+        return ", ".join(parts)
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {
+                op: {
+                    "count": stats.count,
+                    "errors": stats.errors,
+                    "seconds": round(stats.seconds, 6),
+                    "bytes": stats.nbytes,
+                    "pages": stats.pages,
+                    "p50_ms": round(stats.percentile(0.5) * 1000, 3),
+                    "p95_ms": round(stats.percentile(0.95) * 1000, 3),
+                    "max_ms": round(stats.max * 1000, 3),
+                }
+                for op, stats in sorted(self._ops.items())
+            }
+
+    def text(self) -> str:
+        lines = [f"{'operation':<10} {'count':>7} {'errors':>6} {'total s':>8} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8} {'MB/s':>7} {'pages/s':>8}"]
+        for op, stats in self.as_dict().items():
+            seconds = stats["seconds"] or float("inf")
+            lines.append(
+                f"{op:<10} {stats['count']:>7} {stats['errors']:>6} {stats['seconds']:>8.2f} {stats['p50_ms']:>8.1f}"
+                f" {stats['p95_ms']:>8.1f} {stats['max_ms']:>8.1f} {stats['bytes'] / 1_048_576 / seconds:>7.1f}"
+                f" {stats['pages'] / seconds:>8.0f}"
+            )
+        return "\n".join(lines)
+
+    @classmethod
+    def from_log(cls, path: str, since: float | None = None) -> "Histograms":
+        """Rebuild histograms from a JSON-lines event log, e.g. one written by several processes.
+
+        ``since`` (a ``time.time()`` value) skips events that finished before it.
+        """
+        histograms = cls()
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    event = Event(**json.loads(line))
+                    if since is None or event.time >= since:
+                        histograms.record(event)
+        return histograms
+
+
+class JsonLinesSink:
+    """Appends each event to ``path`` as one JSON object per line."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def record(self, event: Event) -> None:
+        line = json.dumps(asdict(event)) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()  # worker processes exit without running atexit handlers
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+class Profiler:
+    """Accumulates a cProfile of measured operations and writes it to ``path``.
+
+    cProfile follows a single thread, so only the outermost operation on
+    one thread at a time is profiled; operations that overlap it on other
+    threads are timed but not profiled.
+    """
+
+    def __init__(self, path: str):
+        import cProfile  # only needed when profiling
+
+        self.path = path
+        self._profile = cProfile.Profile()
+        self._lock = threading.Lock()
+        self._dump_at_exit = False
+
+    def start(self) -> bool:
+        if not self._lock.acquire(blocking=False):
+            return False
+        self._profile.enable()
+        return True
+
+    def stop(self) -> None:
+        self._profile.disable()
+        self._lock.release()
+        if not self._dump_at_exit and _is_worker():
+            # Worker processes skip atexit handlers but run multiprocessing's finalizers
+            from multiprocessing.util import Finalize
+
+            Finalize(None, self.dump, exitpriority=10)
+            self._dump_at_exit = True
+
+    def dump(self) -> None:
+        path = f"{self.path}.{os.getpid()}" if _is_worker() else self.path
+        try:
+            self._profile.dump_stats(path)
+        except OSError as e:
+            print(f"Could not write profile: {e}")
+
+
+def _is_worker() -> bool:
+    """Whether this process was started by the one that turned profiling on."""
+    return os.environ.get(_PARENT_PID_ENV, str(os.getpid())) != str(os.getpid())
+
+
+def log_to(path: str) -> JsonLinesSink:
+    """Log events to ``path`` as JSON lines, here and in worker processes started later."""
+    os.environ[METRICS_ENV] = path
+    for sink in _sinks:
+        if isinstance(sink, JsonLinesSink) and sink.path == path:
+            return sink
+    sink = JsonLinesSink(path)
+    add_sink(sink)
+    return sink
+
+
+def enable_profiling(path: str) -> Profiler:
+    """Profile measured operations into ``path``, here and in worker processes started later."""
+    global _profiler
+    os.environ[PROFILE_ENV] = path
+    os.environ.setdefault(_PARENT_PID_ENV, str(os.getpid()))
+    if _profiler is None or _profiler.path != path:
+        _profiler = Profiler(path)
+        atexit.register(_profiler.dump)
+    return _profiler
+
+
+def _after_fork() -> None:
+    """In a forked worker: drop profiling and lock state inherited from the parent's threads."""
+    global _profiler
+    for sink in _sinks:
+        if hasattr(sink, "_lock"):
+            sink._lock = threading.Lock()
+    if _profiler is not None:
+        _profiler._profile.disable()  # the forking thread may have been profiling
+        _profiler = Profiler(_profiler.path)
+
+
+def configure_from_env() -> None:
+    """Turn on the JSON-lines log and profiling if their environment variables are set."""
+    if os.environ.get(METRICS_ENV):
+        log_to(os.environ[METRICS_ENV])
+    if os.environ.get(PROFILE_ENV):
+        enable_profiling(os.environ[PROFILE_ENV])
+
+
+# In-memory statistics; register with add_sink(histograms) to collect them
+histograms = Histograms()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork)
+configure_from_env()
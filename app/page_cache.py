@@ -0,0 +1,173 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+import appdirs
+from PIL import Image
+
+# Default location and size cap of the rendered-page cache
+CACHE_DIR = appdirs.user_cache_dir("PDF Toolkit", False)
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    doc TEXT NOT NULL,
+    page INTEGER NOT NULL,
+    box_w INTEGER NOT NULL,
+    box_h INTEGER NOT NULL,
+    mode TEXT NOT NULL,
+    width INTEGER NOT NULL,
+    height INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    nbytes INTEGER NOT NULL,
+    atime REAL NOT NULL,
+    PRIMARY KEY (doc, page, box_w, box_h)
+);
+CREATE INDEX IF NOT EXISTS pages_atime ON pages (atime);
+CREATE TABLE IF NOT EXISTS page_words (
+    doc TEXT NOT NULL,
+    page INTEGER NOT NULL,
+    words BLOB NOT NULL,
+    PRIMARY KEY (doc, page)
+);
+"""
+
+
+def document_key(file_path: str, content_hash: bool = False) -> str:
+    """Return a cache key for a document.
+
+    By default the key is derived from the absolute path, size and
+    modification time, which needs a single ``stat``. With ``content_hash``
+    the file contents are hashed instead, so renamed or copied files share
+    their cache entries.
+    """
+    if content_hash:
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        return "sha256:" + digest.hexdigest()
+
+    st = os.stat(file_path)
+    ident = f"{os.path.abspath(file_path)}|{st.st_size}|{st.st_mtime_ns}"
+    return "stat:" + hashlib.sha1(ident.encode("utf-8")).hexdigest()
+
+
+class PageCache:
+    """Persistent cache of rendered pages, stored in an SQLite file.
+
+    Entries are keyed by document key, page number and render box (``None``
+    for native resolution); documents are keyed by path, size and mtime
+    unless ``content_hash`` is set. Pixels are stored zlib-compressed, and
+    when they exceed ``max_bytes`` the least recently used entries are
+    evicted. The words on each page (see ``pdf_tools.TextIndex``) are kept
+    per document too, for as long as any of its pages are cached.
+    SQLite's file locking makes the cache safe to share between
+    threads and between app instances.
+    """
+
+    def __init__(self, path: str | None = None, max_bytes: int = DEFAULT_MAX_BYTES, content_hash: bool = False):
+        if path is None:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            path = os.path.join(CACHE_DIR, "pages.sqlite3")
+        self.path = path
+        self.max_bytes = max_bytes
+        self.content_hash = content_hash
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(nbytes), 0) FROM pages").fetchone()[0]
+
+    def key_for(self, file_path: str) -> str:
+        """Return the document key this cache uses for ``file_path``."""
+        return document_key(file_path, self.content_hash)
+
+    def get(self, doc_key: str, page_num: int, size: tuple[int, int] | None) -> Image.Image | None:
+        """Return the cached rendering of a page, or None."""
+        box_w, box_h = size or (0, 0)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT mode, width, height, data FROM pages WHERE doc=? AND page=? AND box_w=? AND box_h=?",
+                (doc_key, page_num, box_w, box_h),
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE pages SET atime=? WHERE doc=? AND page=? AND box_w=? AND box_h=?",
+                (time.time(), doc_key, page_num, box_w, box_h),
+            )
+        mode, width, height, data = row
+        return Image.frombuffer(mode, (width, height), zlib.decompress(data), "raw", mode, 0, 1)
+
+    def put(self, doc_key: str, page_num: int, size: tuple[int, int] | None, img: Image.Image) -> None:
+        """Store a rendered page, evicting old entries if the cache is over its cap."""
+        box_w, box_h = size or (0, 0)
+        data = zlib.compress(img.tobytes(), 1)
+        with self._lock:
+            old = self._conn.execute(
+                "SELECT nbytes FROM pages WHERE doc=? AND page=? AND box_w=? AND box_h=?",
+                (doc_key, page_num, box_w, box_h),
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (doc_key, page_num, box_w, box_h, img.mode, img.width, img.height, data, len(data), time.time()),
+            )
+            self._total_bytes += len(data) - (old[0] if old else 0)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def get_page_words(self, doc_key: str) -> dict[int, list[str]]:
+        """Return the stored words of every indexed page of a document."""
+        with self._lock:
+            rows = self._conn.execute("SELECT page, words FROM page_words WHERE doc=?", (doc_key,)).fetchall()
+        return {page: zlib.decompress(words).decode("utf-8").split() for page, words in rows}
+
+    def put_page_words(self, doc_key: str, page_words: dict[int, list[str]]) -> None:
+        """Store the words found on some pages of a document."""
+        rows = [(doc_key, page, zlib.compress(" ".join(words).encode("utf-8"), 1)) for page, words in page_words.items()]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany("INSERT OR REPLACE INTO page_words VALUES (?, ?, ?)", rows)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _evict(self) -> None:
+        # Other processes write to the same file, so recount before trimming to 90% of the cap
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(nbytes), 0) FROM pages").fetchone()[0]
+        target = self.max_bytes * 0.9
+        if self._total_bytes <= target:
+            return
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = self._conn.execute("SELECT rowid, nbytes FROM pages ORDER BY atime").fetchall()
+            doomed = []
+            for rowid, nbytes in rows:
+                if self._total_bytes <= target:
+                    break
+                doomed.append((rowid,))
+                self._total_bytes -= nbytes
+            self._conn.executemany("DELETE FROM pages WHERE rowid=?", doomed)
+            self._conn.execute("DELETE FROM page_words WHERE doc NOT IN (SELECT DISTINCT doc FROM pages)")
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def clear(self) -> None:
+        """Remove every cached page and page index."""
+        with self._lock:
+            self._conn.execute("DELETE FROM pages")
+            self._conn.execute("DELETE FROM page_words")
+            self._total_bytes = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
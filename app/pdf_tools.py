@@ -1,53 +1,1756 @@
-import fitz  # PyMuPDF
-from PIL import Image
+from __future__ import annotations
+
+from PIL import Image, ImageFilter
+import bisect
+import hashlib
 import io
+import math
+import os
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict, deque
+from concurrent.futures import as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass
 
-def load_pdf(file_path: str) -> list[Image.Image]:
-    """Load a PDF file and return its pages as a list of PIL images."""
-    pdf_images = []
-    
-    try:
-        # Open the PDF with PyMuPDF
+try:
+    from . import metrics
+    from .startup import LazyModule, preload as _preload
+except ImportError:
+    import metrics
+    from startup import LazyModule, preload as _preload
+
+
+# PyMuPDF and NumPy are slow to import and most of the GUI's startup doesn't
+# need them, so they are loaded on first use (or by preload()) instead
+def _import_fitz():
+    import fitz  # PyMuPDF
+
+    return fitz
+
+
+def _import_numpy():
+    import numpy
+
+    return numpy
+
+
+fitz = LazyModule(_import_fitz)
+np = LazyModule(_import_numpy)
+
+
+def preload() -> None:
+    """Import PyMuPDF and NumPy now, e.g. from a background thread after the window is shown."""
+    _preload(fitz, np)
+
+
+# Output boxes (width, height) of the resolution tiers kept per page. Pages are
+# rendered to fit inside the box; None renders at the page's native 72 dpi.
+RENDER_TIERS: dict[str, tuple[int, int] | None] = {
+    "thumbnail": (102, 132),
+    "preview": (204, 264),
+    "page": None,
+}
+
+
+def open_document(file_path: str, nbytes: int | None = None) -> fitz.Document:
+    """Open ``file_path`` with PyMuPDF, recorded as an ``open`` event (see ``metrics``).
+
+    ``nbytes`` is the file's size, if the caller already knows it. Use the
+    result as a context manager, or close it, like any PyMuPDF document.
+    """
+    with metrics.measure("open", file_path) as measured:
         pdf_document = fitz.open(file_path)
-        
-        for page_num in range(len(pdf_document)):
-            page = pdf_document.load_page(page_num)  # Load the page
-            
-            # Render page to a pixmap (image in PyMuPDF terms)
-            pix = page.get_pixmap()
-            
-            # Convert the pixmap to a bytes object and open it as an image using PIL
-            img = Image.open(io.BytesIO(pix.tobytes("png")))
-            pdf_images.append(img)
-        
-        pdf_document.close()
+        measured.nbytes = os.path.getsize(file_path) if nbytes is None else nbytes
+        measured.pages = pdf_document.page_count
+    return pdf_document
+
+
+class DocumentSession:
+    """One open PyMuPDF handle on a file, plus metadata parsed from it on demand.
+
+    Sessions are handed out by a ``SessionPool``; several users of the same
+    file (the preview, the edit journal, a merge) share one handle instead
+    of each parsing the file again.
+    """
+
+    def __init__(self, file_path: str, stat: os.stat_result):
+        self.file_path = file_path
+        self.size = stat.st_size
+        self.mtime_ns = stat.st_mtime_ns
+        self.document = open_document(file_path, stat.st_size)
+        self.refs = 0
+        self._page_sizes = None
+        self._rotations = None
+
+    @property
+    def page_count(self) -> int:
+        return self.document.page_count
+
+    def page_sizes(self) -> list[tuple[float, float]]:
+        """Displayed width and height of every page in points, read without loading the pages."""
+        if self._page_sizes is None:
+            sizes = []
+            for page_num, rotation in enumerate(self.rotations()):
+                box = self.document.page_cropbox(page_num)
+                sizes.append((box.height, box.width) if rotation % 180 else (box.width, box.height))
+            self._page_sizes = sizes
+        return self._page_sizes
+
+    def rotations(self) -> list[int]:
+        """The /Rotate value stored on every page."""
+        if self._rotations is None:
+            rotations = []
+            for page_num in range(self.page_count):
+                kind, value = self.document.xref_get_key(self.document.page_xref(page_num), "Rotate")
+                rotations.append(int(value) if kind == "int" else 0)
+            self._rotations = rotations
+        return self._rotations
+
+    def matches(self, stat: os.stat_result) -> bool:
+        """Whether the file on disk is still the one this session parsed."""
+        return stat.st_size == self.size and stat.st_mtime_ns == self.mtime_ns
+
+    def close(self) -> None:
+        self.document.close()
+
+
+class SessionPool:
+    """Shares one DocumentSession per file between all users of that file.
+
+    ``acquire()`` returns the open session for a path, reopening it if the
+    file's size or modification time changed since it was parsed, and
+    ``release()`` hands it back. Released sessions stay open (up to
+    ``max_idle`` of them, least recently used closed first) so the next
+    user skips the parse. Anyone who modifies ``session.document`` must call
+    ``invalidate()`` so the changed handle is not handed out again.
+    """
+
+    def __init__(self, max_idle: int = 8):
+        self.max_idle = max_idle
+        self._sessions: OrderedDict[str, DocumentSession] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, file_path: str) -> DocumentSession:
+        path = os.path.abspath(file_path)
+        stat = os.stat(path)
+        with self._lock:
+            session = self._sessions.get(path)
+            if session is not None and not session.matches(stat):
+                self._drop(path)
+                session = None
+            if session is None:
+                session = DocumentSession(path, stat)
+                self._sessions[path] = session
+            session.refs += 1
+            self._sessions.move_to_end(path)
+            self._trim()
+            return session
+
+    def release(self, session: DocumentSession) -> None:
+        with self._lock:
+            session.refs -= 1
+            if self._sessions.get(session.file_path) is not session:
+                if session.refs <= 0:
+                    session.close()  # dropped from the pool while in use
+            else:
+                self._trim()
+
+    @contextmanager
+    def session(self, file_path: str):
+        """Context manager around ``acquire()``/``release()``."""
+        session = self.acquire(file_path)
+        try:
+            yield session
+        finally:
+            self.release(session)
+
+    def invalidate(self, file_path: str) -> None:
+        """Stop handing out the session for ``file_path``; it closes once every user releases it."""
+        with self._lock:
+            self._drop(os.path.abspath(file_path))
+
+    def close_all(self) -> None:
+        with self._lock:
+            for path in list(self._sessions):
+                self._drop(path)
+
+    def _drop(self, path: str) -> None:
+        session = self._sessions.pop(path, None)
+        if session is not None and session.refs <= 0:
+            session.close()
+
+    def _trim(self) -> None:
+        idle = [path for path, session in self._sessions.items() if session.refs <= 0]
+        for path in idle[: max(0, len(idle) - self.max_idle)]:
+            self._drop(path)
+
+
+# Process-wide pool used by every pdf_tools operation that reads a file
+sessions = SessionPool()
+
+
+class PageSequence:
+    """A list-like view of a PDF's pages that renders each page on first access.
+
+    Indexing returns the page at the ``default_tier`` resolution; ``get()``
+    asks for a specific tier from ``RENDER_TIERS``. Rendered images are kept
+    in a bounded LRU cache, limited by entry count (``max_pages``) and
+    optionally by the estimated size in bytes (``max_bytes``). A persistent
+    ``disk_cache`` (see ``page_cache.PageCache``) is consulted before
+    rendering, so reopening a document skips rasterization. The document
+    is read through the shared ``sessions`` pool. Deleting an
+    index removes the page from the view only; the source file is never
+    modified.
+
+    The page list and caches are guarded by a lock, so one thread may
+    render pages while another deletes them or calls ``cached()``; the
+    document itself must still only be used from one thread at a time.
+    ``version`` changes whenever indices may refer to different pages
+    (load, clear, deletions), so views can tell their indices are stale.
+    """
+
+    def __init__(
+        self,
+        file_path: str | None = None,
+        max_pages: int = 32,
+        max_bytes: int | None = None,
+        default_tier: str = "page",
+        disk_cache=None,
+    ):
+        self.max_pages = max_pages
+        self.max_bytes = max_bytes
+        self.default_tier = default_tier
+        self.disk_cache = disk_cache
+        self.file_path = None
+        self.session = None
+        self._doc_key = None
+        self._pages: list[int] = []  # view index -> page number in the source file
+        self._cache: OrderedDict[tuple[int, str], Image.Image] = OrderedDict()
+        self._cache_bytes = 0
+        self._lock = threading.RLock()
+        self.version = 0
+        if file_path is not None:
+            self.load(file_path)
+
+    def load(self, file_path: str) -> int:
+        """Open ``file_path`` (replacing any current document) and return its page count."""
+        self.clear()
+        session = sessions.acquire(file_path)
+        doc_key = self.disk_cache.key_for(file_path) if self.disk_cache is not None else None
+        with self._lock:
+            self.session = session
+            self.file_path = file_path
+            self._doc_key = doc_key
+            self._pages = list(range(session.page_count))
+            self.version += 1
+            return len(self._pages)
+
+    def clear(self) -> None:
+        """Drop all pages and cached images and release the underlying document."""
+        with self._lock:
+            if self.session is not None:
+                sessions.release(self.session)
+            self.session = None
+            self.file_path = None
+            self._doc_key = None
+            self._pages = []
+            self._cache.clear()
+            self._cache_bytes = 0
+            self.version += 1
+
+    def __len__(self) -> int:
+        return len(self._pages)
+
+    def __iter__(self):
+        for index in range(len(self._pages)):
+            yield self[index]
+
+    def __getitem__(self, index: int) -> Image.Image:
+        return self.get(index, self.default_tier)
+
+    def get(self, index: int, tier: str = "preview") -> Image.Image:
+        """Return the page at ``index`` rendered for the given resolution tier."""
+        with self._lock:
+            page_num = self._pages[index]
+            img = self._from_memory(page_num, tier)
+        if img is None:
+            img = self._from_disk(page_num, tier)
+        if img is None:
+            img = render_page(self.session.document.load_page(page_num), RENDER_TIERS[tier])
+            if self.disk_cache is not None:
+                try:
+                    self.disk_cache.put(self._doc_key, page_num, RENDER_TIERS[tier], img)
+                except Exception as e:
+                    print(f"Error writing page cache: {e}")
+            self._remember(page_num, tier, img)
+        return img
+
+    def cached(self, index: int, tier: str = "preview") -> Image.Image | None:
+        """Return the page at ``index`` if it is in the memory or disk cache, without rendering."""
+        with self._lock:
+            page_num = self._pages[index]
+            img = self._from_memory(page_num, tier)
+        if img is None:
+            img = self._from_disk(page_num, tier)
+        return img
+
+    def _from_memory(self, page_num: int, tier: str) -> Image.Image | None:
+        img = self._cache.get((page_num, tier))
+        if img is not None:
+            self._cache.move_to_end((page_num, tier))
+        return img
+
+    def _from_disk(self, page_num: int, tier: str) -> Image.Image | None:
+        if self.disk_cache is None:
+            return None
+        try:
+            img = self.disk_cache.get(self._doc_key, page_num, RENDER_TIERS[tier])
+        except Exception as e:
+            print(f"Error reading page cache: {e}")
+            return None
+        if img is not None:
+            self._remember(page_num, tier, img)
+        return img
+
+    def _remember(self, page_num: int, tier: str, img: Image.Image) -> None:
+        with self._lock:
+            if (page_num, tier) in self._cache:
+                return
+            self._cache[(page_num, tier)] = img
+            self._cache_bytes += _image_nbytes(img)
+            self._evict()
+
+    def __delitem__(self, index: int) -> None:
+        with self._lock:
+            self._drop_cached(self._pages.pop(index))
+            self.version += 1
+
+    def delete_pages(self, indices) -> None:
+        """Remove several view indices from the sequence in one pass."""
+        doomed = set(indices)
+        with self._lock:
+            for index in doomed:
+                self._drop_cached(self._pages[index])
+            self._pages = [page_num for index, page_num in enumerate(self._pages) if index not in doomed]
+            self.version += 1
+
+    def view_indices(self, page_nums) -> list[int]:
+        """Return the current view indices of source pages, skipping pages that were removed."""
+        with self._lock:
+            positions = {page_num: index for index, page_num in enumerate(self._pages)}
+        return sorted(positions[page_num] for page_num in page_nums if page_num in positions)
+
+    def _drop_cached(self, page_num: int) -> None:
+        for tier in RENDER_TIERS:
+            img = self._cache.pop((page_num, tier), None)
+            if img is not None:
+                self._cache_bytes -= _image_nbytes(img)
+
+    def _evict(self) -> None:
+        # Always keep the most recently rendered page, even if it alone exceeds max_bytes
+        while len(self._cache) > 1 and (
+            len(self._cache) > self.max_pages
+            or (self.max_bytes is not None and self._cache_bytes > self.max_bytes)
+        ):
+            _, img = self._cache.popitem(last=False)
+            self._cache_bytes -= _image_nbytes(img)
+
+
+def page_matrix(page: fitz.Page, size: tuple[int, int] | None = None) -> fitz.Matrix:
+    """Return the matrix that renders ``page`` to fit inside a ``(width, height)`` box."""
+    if size is None:
+        return fitz.Identity
+    zoom = min(size[0] / page.rect.width, size[1] / page.rect.height)
+    return fitz.Matrix(zoom, zoom)
+
+
+def pixmap_to_image(pix: fitz.Pixmap) -> Image.Image:
+    """Wrap a pixmap's raw samples in a PIL image without encoding them."""
+    mode = {1: "L", 3: "RGB", 4: "RGBA"}[pix.n]
+    return Image.frombuffer(mode, (pix.width, pix.height), pix.samples, "raw", mode, pix.stride, 1)
+
+
+def render_page(page: fitz.Page, size: tuple[int, int] | None = None, grayscale: bool = False) -> Image.Image:
+    """Render a single page straight to a PIL image at the requested output size."""
+    colorspace = fitz.csGRAY if grayscale else fitz.csRGB
+    with metrics.measure("render") as measured:
+        pix = page.get_pixmap(matrix=page_matrix(page, size), colorspace=colorspace, alpha=False)
+        img = pixmap_to_image(pix)
+        measured.nbytes = pix.width * pix.height * pix.n
+        measured.pages = 1
+    return img
+
+
+# Below this many pages, starting a process pool costs more than it saves
+PARALLEL_RENDER_MIN_PAGES = 48
+
+
+@contextmanager
+def _process_pool(workers: int, initializer=None, initargs: tuple = ()):
+    """Run a process pool for the ``with`` block, then shut it down.
+
+    Tasks not yet started are dropped when the block is left early, e.g.
+    after an error or a progress callback that cancelled the job.
+    """
+    from concurrent.futures import ProcessPoolExecutor  # pulls in multiprocessing; only needed here
+
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs)
+    try:
+        yield pool
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+# Document a pool's worker process serves, opened once per process rather than per task
+_worker_document = None
+
+
+def _open_worker_document(file_path: str) -> None:
+    """Worker initializer: open ``file_path`` for every task this process gets."""
+    global _worker_document
+    _worker_document = open_document(file_path)
+
+
+def _render_page_range(
+    page_nums: list[int], size: tuple[int, int] | None, grayscale: bool
+) -> list[tuple[int, str, int, int, bytes]]:
+    """Worker: render ``page_nums`` of this process's copy of the document to raw pixel buffers."""
+    rendered = []
+    for page_num in page_nums:
+        img = render_page(_worker_document.load_page(page_num), size, grayscale)
+        rendered.append((page_num, img.mode, img.width, img.height, img.tobytes()))
+    return rendered
+
+
+def render_pages(
+    file_path: str,
+    page_nums: list[int] | None = None,
+    size: tuple[int, int] | None = None,
+    grayscale: bool = False,
+    workers: int | None = None,
+    chunk_size: int = 8,
+):
+    """Render pages of a PDF across a process pool, yielding ``(page_num, image)`` in page order.
+
+    Each worker opens the file once and renders contiguous chunks of
+    pages; chunks are yielded as soon as every earlier chunk has arrived,
+    and only a couple of chunks per worker are in flight at once. Small jobs
+    (fewer than ``PARALLEL_RENDER_MIN_PAGES`` pages) or ``workers=1`` are
+    rendered serially in this process.
+    """
+    if page_nums is None:
+        with sessions.session(file_path) as session:
+            page_nums = list(range(session.page_count))
+    workers = workers or os.cpu_count() or 1
+
+    if workers <= 1 or len(page_nums) < PARALLEL_RENDER_MIN_PAGES:
+        with sessions.session(file_path) as session:
+            for page_num in page_nums:
+                yield page_num, render_page(session.document.load_page(page_num), size, grayscale)
+        return
+
+    chunks = [page_nums[i : i + chunk_size] for i in range(0, len(page_nums), chunk_size)]
+    with _process_pool(min(workers, len(chunks)), _open_worker_document, (file_path,)) as pool:
+        pending = deque()
+        next_chunk = 0
+        while next_chunk < len(chunks) or pending:
+            while next_chunk < len(chunks) and len(pending) < workers * 2:
+                pending.append(pool.submit(_render_page_range, chunks[next_chunk], size, grayscale))
+                next_chunk += 1
+            for page_num, mode, width, height, data in pending.popleft().result():
+                yield page_num, Image.frombuffer(mode, (width, height), data, "raw", mode, 0, 1)
+
+
+def _image_nbytes(img: Image.Image) -> int:
+    """Estimate the memory held by a decoded PIL image."""
+    return img.width * img.height * len(img.getbands())
+
+
+def load_pdf(file_path: str, max_pages: int = 32, max_bytes: int | None = None) -> PageSequence:
+    """Open a PDF file and return its pages as a lazily rendered PageSequence."""
+    pdf_images = PageSequence(max_pages=max_pages, max_bytes=max_bytes)
+
+    try:
+        pdf_images.load(file_path)
     except Exception as e:
         print(f"Error loading PDF: {e}")
-    
+
     return pdf_images
 
+# Save profiles: keyword arguments for Document.save, plus optional image
+# downsampling of images shown above ``image_dpi`` (recompressed to JPEG at
+# ``image_quality``). "fast" writes as-is, "balanced" drops unused objects and
+# compresses streams, "smallest" also merges duplicates and downsamples images.
+# Duplicate merging (garbage >= 3) is only fast together with ``clean``.
+SAVE_PROFILES: dict[str, dict] = {
+    "fast": {},
+    "balanced": {"garbage": 2, "deflate": True, "use_objstms": True},
+    "smallest": {
+        "garbage": 4,
+        "clean": True,
+        "deflate": True,
+        "deflate_images": True,
+        "deflate_fonts": True,
+        "use_objstms": True,
+        "image_dpi": 150,
+        "image_quality": 75,
+    },
+}
+DEFAULT_SAVE_PROFILE = "balanced"
+
+
+@dataclass
+class SaveReport:
+    """Outcome of ``save_document``: where, how big and how long it took."""
+
+    path: str
+    profile: str
+    size: int
+    seconds: float
+    page_count: int
+    images_resampled: int = 0
+    objects_deduplicated: int = 0
+    bytes_deduplicated: int = 0
+
+    def summary(self) -> str:
+        text = f"{self.page_count} pages, {self.size / 1_048_576:.1f} MB in {self.seconds:.2f} s ({self.profile})"
+        if self.objects_deduplicated:
+            text += f", {self.bytes_deduplicated / 1_048_576:.1f} MB of duplicate resources removed"
+        return text
+
+
+def downsample_images(pdf_document: fitz.Document, target_dpi: int, quality: int = 75) -> int:
+    """Recompress images displayed above ``target_dpi`` to JPEG at ``target_dpi``.
+
+    The effective resolution of an image is taken from the largest area it
+    is drawn in on any page, so an image shared between pages (a logo, or
+    resources merged by ``deduplicate_resources``) keeps enough pixels for
+    its biggest use. Images with a soft mask and 1-bit images are left
+    alone, since JPEG would lose transparency or inflate bilevel scans.
+    Returns the number of images replaced.
+    """
+    # xref -> [width, height, widest shown width, tallest shown height (inches), a page using it]
+    images: dict[int, list] = {}
+    for page in pdf_document:
+        for xref, smask, width, height, bpc, *_ in page.get_images(full=True):
+            if smask or bpc == 1:
+                continue
+            rects = page.get_image_rects(xref)
+            shown_w = max((rect.width for rect in rects), default=0) / 72
+            shown_h = max((rect.height for rect in rects), default=0) / 72
+            found = images.setdefault(xref, [width, height, 0.0, 0.0, page.number])
+            found[2] = max(found[2], shown_w)
+            found[3] = max(found[3], shown_h)
+
+    replaced = 0
+    for xref, (width, height, shown_w, shown_h, page_num) in images.items():
+        if shown_w <= 0 or shown_h <= 0:
+            continue
+        dpi = min(width / shown_w, height / shown_h)
+        if dpi <= target_dpi:
+            continue
+
+        pix = fitz.Pixmap(pdf_document, xref)
+        if pix.alpha:
+            pix = fitz.Pixmap(pix, 0)
+        if pix.n not in (1, 3):
+            pix = fitz.Pixmap(fitz.csRGB, pix)
+        scale = target_dpi / dpi
+        img = pixmap_to_image(pix)
+        img = img.resize((max(1, round(img.width * scale)), max(1, round(img.height * scale))), Image.Resampling.LANCZOS)
+        buffer = io.BytesIO()
+        img.save(buffer, format="JPEG", quality=quality, optimize=True)
+        pdf_document[page_num].replace_image(xref, stream=buffer.getvalue())
+        replaced += 1
+    return replaced
+
+
+def save_document(pdf_document: fitz.Document, output_path: str, profile: str = DEFAULT_SAVE_PROFILE) -> SaveReport:
+    """Save ``pdf_document`` to ``output_path`` using one of ``SAVE_PROFILES``."""
+    options = dict(SAVE_PROFILES[profile])
+    image_dpi = options.pop("image_dpi", None)
+    image_quality = options.pop("image_quality", 75)
+
+    start = time.perf_counter()
+    with metrics.measure("save", output_path) as measured:
+        images_resampled = downsample_images(pdf_document, image_dpi, image_quality) if image_dpi else 0
+        pdf_document.save(output_path, **options)
+        report = SaveReport(
+            path=output_path,
+            profile=profile,
+            size=os.path.getsize(output_path),
+            seconds=time.perf_counter() - start,
+            page_count=pdf_document.page_count,
+            images_resampled=images_resampled,
+        )
+        measured.nbytes = report.size
+        measured.pages = report.page_count
+    return report
+
+
+# Indirect dictionaries (besides streams) that may be shared once their contents match
+_SHAREABLE_TYPES = ("/Font", "/FontDescriptor", "/ExtGState", "/Encoding")
+_REFERENCE = re.compile(r"\b(\d+) 0 R\b")
+_LENGTH_KEY = re.compile(r"/Length \d+")
+
+
+@dataclass
+class DedupReport:
+    """Outcome of ``deduplicate_resources``."""
+
+    objects_merged: int = 0
+    bytes_saved: int = 0  # size of the removed copies as they would have been saved
+
+
+def deduplicate_resources(pdf_document: fitz.Document, deflate: bool = True) -> DedupReport:
+    """Collapse identical resources copied in from different inputs into one shared object.
+
+    Streams (images, embedded fonts, ICC profiles, forms) are compared by a
+    hash of their raw bytes and dictionary; font, font descriptor, graphics
+    state and encoding dictionaries by their definition. References to
+    duplicates are rewritten to the first copy and the duplicates are
+    emptied. Passes repeat until nothing changes, so a font whose embedded
+    file was merged in one pass can itself be merged in the next. Unfiltered
+    streams count at their compressed size when the document will be saved
+    with ``deflate``.
+    """
+    report = DedupReport()
+    merged: set[int] = set()
+
+    while True:
+        first_seen = {}
+        duplicates = {}  # duplicate xref -> xref of the copy that is kept
+        for xref in range(1, pdf_document.xref_length()):
+            if xref in merged:
+                continue
+            if pdf_document.xref_is_stream(xref):
+                raw = pdf_document.xref_stream_raw(xref)
+                if not raw:
+                    continue
+                header = _LENGTH_KEY.sub("", pdf_document.xref_object(xref, compressed=True))
+                key = hashlib.sha256(header.encode() + b"\0" + raw).digest()
+            elif pdf_document.xref_get_key(xref, "Type")[1] in _SHAREABLE_TYPES:
+                key = pdf_document.xref_object(xref, compressed=True)
+                raw = None
+            else:
+                continue
+            original = first_seen.setdefault(key, xref)
+            if original != xref:
+                duplicates[xref] = original
+                report.bytes_saved += len(key) if raw is None else _stored_size(pdf_document, xref, raw, deflate)
+
+        if not duplicates:
+            return report
+        _redirect_references(pdf_document, duplicates, merged)
+        for xref in duplicates:
+            pdf_document.update_object(xref, "null")  # also drops the stream
+        merged.update(duplicates)
+        report.objects_merged += len(duplicates)
+
+
+def _stored_size(pdf_document: fitz.Document, xref: int, raw: bytes, deflate: bool) -> int:
+    """Bytes the data of stream ``xref`` takes in a saved file."""
+    if not deflate or pdf_document.xref_get_key(xref, "Filter")[0] != "null":
+        return len(raw)
+    return len(zlib.compress(raw))
+
+
+def _redirect_references(pdf_document: fitz.Document, duplicates: dict[int, int], skip: set[int]) -> None:
+    """Point every reference to a key of ``duplicates`` at its value instead."""
+
+    def redirect(text: str) -> str:
+        return _REFERENCE.sub(lambda m: f"{duplicates.get(int(m.group(1)), int(m.group(1)))} 0 R", text)
+
+    for xref in range(1, pdf_document.xref_length()):
+        if xref in skip or xref in duplicates:
+            continue
+        definition = pdf_document.xref_object(xref, compressed=True)
+        if not any(int(ref) in duplicates for ref in _REFERENCE.findall(definition)):
+            continue
+        if pdf_document.xref_is_stream(xref):
+            # Replacing a stream's whole definition would discard its data, so rewrite key by key
+            for key in pdf_document.xref_get_keys(xref):
+                value = pdf_document.xref_get_key(xref, key)[1]
+                new_value = redirect(value)
+                if new_value != value:
+                    pdf_document.xref_set_key(xref, key, new_value)
+        else:
+            pdf_document.update_object(xref, redirect(definition))
+
+
+def parse_page_ranges(spec: str, page_count: int) -> list[int]:
+    """Parse a 1-based page range expression into 0-based page indices.
+
+    ``spec`` is a comma-separated list of pages (``97``), closed ranges
+    (``1-40``) and open ranges (``200-`` to the last page, ``-5`` from the
+    first). Indices are returned in the order given, without duplicates.
+    Raises ValueError for malformed or out-of-range entries.
+    """
+    indices = []
+    seen = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            if "-" in part:
+                first, last = (bound.strip() for bound in part.split("-", 1))
+                first = int(first) if first else 1
+                last = int(last) if last else page_count
+            else:
+                first = last = int(part)
+        except ValueError:
+            raise ValueError(f"Invalid page range: {part!r}") from None
+        if not 1 <= first <= last <= page_count:
+            raise ValueError(f"Page range {part!r} is outside 1-{page_count}")
+        for index in range(first - 1, last):
+            if index not in seen:
+                seen.add(index)
+                indices.append(index)
+    return indices
+
+
+class EditJournal:
+    """Records page removals, reorders and rotations without touching the document.
+
+    Operations refer to page positions in the current (already edited) view
+    and only update a list mapping positions to source pages, so each one is
+    cheap regardless of how many pages it covers. ``apply()`` replays the
+    whole journal onto a document with a single ``select()``.
+    """
+
+    def __init__(self, page_count: int):
+        self.page_count = page_count
+        self.order: list[int] = list(range(page_count))  # position -> source page
+        self.rotations: dict[int, int] = {}  # source page -> degrees added
+        self.ops: list[tuple] = []  # human-readable log of recorded operations
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.ops)
+
+    def _positions(self, pages) -> list[int]:
+        if isinstance(pages, str):
+            return parse_page_ranges(pages, len(self.order))
+        if isinstance(pages, int):
+            pages = [pages]
+        positions = list(pages)
+        for position in positions:
+            if not 0 <= position < len(self.order):
+                raise IndexError(f"Page index {position} out of range")
+        return positions
+
+    def remove(self, pages) -> int:
+        """Remove pages given as a range expression, an index or indices; return how many."""
+        doomed = set(self._positions(pages))
+        self.order = [page for position, page in enumerate(self.order) if position not in doomed]
+        self.ops.append(("remove", sorted(doomed)))
+        return len(doomed)
+
+    def move(self, source: int, target: int) -> None:
+        """Move the page at position ``source`` to position ``target``."""
+        self._positions([source, target])
+        self.order.insert(target, self.order.pop(source))
+        self.ops.append(("move", source, target))
+
+    def reorder(self, positions: list[int]) -> None:
+        """Rearrange pages so that new position i shows current position ``positions[i]``."""
+        if sorted(positions) != list(range(len(self.order))):
+            raise ValueError("Reorder must list every current page position exactly once")
+        self.order = [self.order[position] for position in positions]
+        self.ops.append(("reorder", list(positions)))
+
+    def rotate(self, pages, degrees: int) -> None:
+        """Rotate pages clockwise by a multiple of 90 degrees."""
+        if degrees % 90:
+            raise ValueError("Rotation must be a multiple of 90 degrees")
+        positions = self._positions(pages)
+        for position in positions:
+            page = self.order[position]
+            self.rotations[page] = (self.rotations.get(page, 0) + degrees) % 360
+        self.ops.append(("rotate", positions, degrees))
+
+    def apply(self, pdf_document: fitz.Document) -> None:
+        """Apply every recorded operation to ``pdf_document`` in one pass."""
+        if self.order != list(range(pdf_document.page_count)):
+            pdf_document.select(self.order)
+        for position, page in enumerate(self.order):
+            degrees = self.rotations.get(page)
+            if degrees:
+                pdf_page = pdf_document[position]
+                pdf_page.set_rotation((pdf_page.rotation + degrees) % 360)
+
+    def save(
+        self,
+        pdf_document: fitz.Document,
+        output_path: str,
+        incremental: bool = True,
+        profile: str = DEFAULT_SAVE_PROFILE,
+    ) -> SaveReport:
+        """Apply the journal and write ``pdf_document`` to ``output_path``.
+
+        When ``output_path`` is the document's own file and ``incremental`` is
+        set, the changes are appended to the file instead of rewriting it
+        (reported as profile ``"incremental"``); otherwise the document is
+        written with the given save profile.
+        """
+        self.apply(pdf_document)
+        same_file = bool(pdf_document.name) and os.path.exists(output_path) and os.path.samefile(
+            pdf_document.name, output_path
+        )
+        if incremental and same_file and pdf_document.can_save_incrementally():
+            start = time.perf_counter()
+            with metrics.measure("save", output_path) as measured:
+                # PyMuPDF requires the name exactly as opened, not an equivalent spelling of the path
+                pdf_document.save(pdf_document.name, incremental=True, encryption=fitz.PDF_ENCRYPT_KEEP)
+                report = SaveReport(
+                    path=output_path,
+                    profile="incremental",
+                    size=os.path.getsize(output_path),
+                    seconds=time.perf_counter() - start,
+                    page_count=pdf_document.page_count,
+                )
+                measured.nbytes = report.size
+                measured.pages = report.page_count
+        else:
+            report = save_document(pdf_document, output_path, profile)
+
+        # Only a successful write makes the edits part of the document; after
+        # an error the journal still holds them, so the user can save again
+        self.page_count = pdf_document.page_count
+        self.order = list(range(self.page_count))
+        self.rotations.clear()
+        self.ops.clear()
+        return report
+
 def get_page_count(file_path: str) -> int:
     """Return the total number of pages in the PDF."""
     try:
-        pdf_document = fitz.open(file_path)
-        page_count = pdf_document.page_count
-        pdf_document.close()
-        return page_count
+        with sessions.session(file_path) as session:
+            return session.page_count
     except Exception as e:
         print(f"Error getting page count: {e}")
         return 0
 
-def merge_files(file_paths: list[str], output_path: str) -> None:
-    """Merge multiple PDF files into a single PDF file."""
+# Image types the merge engine places directly on a page
+IMAGE_EXTENSIONS = ("jpg", "jpeg", "png", "tif", "tiff", "webp", "bmp")
+# Formats whose files may hold several pages, each added as its own page
+MULTI_FRAME_FORMATS = ("TIFF",)
+
+# Page size for images merged before any PDF has set one (US Letter, in points)
+DEFAULT_PAGE_SIZE = (612, 792)
+
+# Images with more pixels than their page shows at this resolution are decoded
+# at reduced size; None keeps every image at its native resolution
+MERGE_IMAGE_DPI = 300
+# Decoded frames of these formats are stored as JPEG; raw samples would be stored
+# losslessly and come out many times larger than the source
+_LOSSY_FORMATS = ("JPEG", "WEBP")
+_JPEG_QUALITY = 90
+
+# PIL mode -> (PyMuPDF colorspace name, has alpha) for frames handed over as raw samples
+_PIXMAP_MODES = {
+    "L": ("csGRAY", False),
+    "LA": ("csGRAY", True),
+    "RGB": ("csRGB", False),
+    "RGBA": ("csRGB", True),
+    "CMYK": ("csCMYK", False),
+}
+
+
+def _file_ext(file_path: str) -> str:
+    return file_path.lower().split('.')[-1]
+
+
+def _pixel_box(page_size: tuple[float, float], dpi: int | None) -> tuple[int, int] | None:
+    """Pixels needed to fill ``page_size`` (points) at ``dpi``."""
+    if dpi is None:
+        return None
+    return math.ceil(page_size[0] * dpi / 72), math.ceil(page_size[1] * dpi / 72)
+
+
+def _reduce_factor(img: Image.Image, box: tuple[int, int] | None) -> int:
+    """Integer factor by which ``img`` can shrink and still fill ``box``; 1 if it cannot.
+
+    Draft-mode JPEG decoding and ``Image.reduce`` both only shrink by whole
+    factors of 2 or more, so an image less than twice the size of ``box``
+    is kept at its native resolution.
+    """
+    if box is None:
+        return 1
+    return max(1, int(min(img.width / box[0], img.height / box[1])))
+
+
+def _eight_bit(frame: Image.Image) -> Image.Image:
+    """Convert modes ``Image.reduce`` rejects: bilevel and 16-bit grey to 8-bit grey, palettes to RGB(A)."""
+    if frame.mode == "1":
+        return frame.convert("L")
+    if frame.mode.startswith("I;16"):
+        # Scale to 8 bits; a plain convert("L") clips everything above 255 to white
+        return frame.convert("I").point(lambda v: v * (1 / 256)).convert("L")
+    if frame.mode == "P":
+        return frame.convert("RGBA" if "transparency" in frame.info else "RGB")
+    return frame
+
+
+def _reduced_frame(img: Image.Image, box: tuple[int, int] | None) -> Image.Image:
+    """Decode the current frame of ``img``, at reduced resolution if ``box`` needs fewer pixels.
+
+    JPEGs are decoded straight at 1/2, 1/4 or 1/8 scale (draft mode), so the
+    full-size pixels never exist in memory; other formats are decoded once
+    and shrunk by an integer factor with ``Image.reduce``. The result is
+    never smaller than ``box``.
+    """
+    factor = _reduce_factor(img, box)
+    if factor >= 2 and img.format == "JPEG":
+        img.draft(img.mode, (math.ceil(img.width / factor), math.ceil(img.height / factor)))
+    img.load()
+    factor = _reduce_factor(img, box)  # what is left after draft mode
+    if factor >= 2:
+        return _eight_bit(img).reduce(factor)
+    return img
+
+
+def _frame_pixmap(frame: Image.Image) -> fitz.Pixmap:
+    """Hand a decoded frame to PyMuPDF as raw samples, without encoding it."""
+    frame = _eight_bit(frame)
+    if frame.mode not in _PIXMAP_MODES:
+        if frame.mode in ("I", "F"):
+            frame = frame.convert("L")
+        elif frame.mode == "PA" or "transparency" in frame.info:
+            frame = frame.convert("RGBA")
+        else:
+            frame = frame.convert("RGB")
+    colorspace, alpha = _PIXMAP_MODES[frame.mode]
+    return fitz.Pixmap(getattr(fitz, colorspace), frame.width, frame.height, frame.tobytes(), int(alpha))
+
+
+def _deflate_image(pdf_document: fitz.Document, xref: int) -> None:
+    """Compress an image, and its soft mask, that PyMuPDF stored as raw samples.
+
+    ``insert_image`` keeps decoded images uncompressed until the document is
+    saved, so a merge would otherwise hold every frame at full size at once.
+    Deflating here gives the same bytes the save would write.
+    """
+    smask = pdf_document.xref_get_key(xref, "SMask")
+    for image_xref in (xref, int(smask[1].split()[0]) if smask[0] == "xref" else None):
+        if image_xref is not None and pdf_document.xref_get_key(image_xref, "Filter")[0] == "null":
+            data = zlib.compress(pdf_document.xref_stream_raw(image_xref))
+            pdf_document.update_stream(image_xref, data, compress=False)
+            pdf_document.xref_set_key(image_xref, "Filter", "/FlateDecode")
+
+
+def _insert_image_page(
+    merger: fitz.Document, image_path: str, page_size: tuple[float, float], dpi: int | None = MERGE_IMAGE_DPI
+) -> int:
+    """Append one page of ``page_size`` per image frame, fitted and centered; return the page count.
+
+    JPEG and PNG files that cannot be reduced are copied through as-is.
+    Everything else is decoded one frame at a time (see ``_reduced_frame``)
+    and deflated as soon as it is placed (see ``_deflate_image``), so memory
+    use is bounded by the largest frame, not by the whole file.
+    """
+    box = _pixel_box(page_size, dpi)
+    img = Image.open(image_path)
     try:
+        frames = getattr(img, "n_frames", 1) if img.format in MULTI_FRAME_FORMATS else 1
+        if frames == 1 and _reduce_factor(img, box) == 1 and img.format in ("JPEG", "PNG"):
+            with open(image_path, "rb") as f:
+                data = f.read()
+            page = merger.new_page(width=page_size[0], height=page_size[1])
+            # JPEG data is embedded unchanged, at the image's native resolution
+            _deflate_image(merger, page.insert_image(page.rect, stream=data, keep_proportion=True))
+            return 1
+
+        source_format = img.format
+        for index in range(frames):
+            img.seek(index)  # TIFF frames are read from the file one at a time
+            frame = _reduced_frame(img, box)
+            if frames == 1 and frame is not img:
+                img.close()  # free the full-size pixels before the reduced copy is converted
+            page = merger.new_page(width=page_size[0], height=page_size[1])
+            if source_format in _LOSSY_FORMATS and frame.mode in ("L", "RGB", "CMYK"):
+                buffer = io.BytesIO()
+                frame.save(buffer, format="JPEG", quality=_JPEG_QUALITY)
+                xref = page.insert_image(page.rect, stream=buffer.getvalue(), keep_proportion=True)
+            else:
+                xref = page.insert_image(page.rect, pixmap=_frame_pixmap(frame), keep_proportion=True)
+            del frame
+            _deflate_image(merger, xref)
+    finally:
+        img.close()
+    return frames
+
+
+def merge_inputs(
+    file_paths: list[str],
+    output_path: str,
+    progress=None,
+    profile: str = DEFAULT_SAVE_PROFILE,
+    dedup: bool = True,
+    image_dpi: int | None = MERGE_IMAGE_DPI,
+) -> SaveReport:
+    """Merge PDFs and images, in the given order, into a single PDF file.
+
+    Pages of the first PDF set the page size used for the images that
+    follow it (US Letter until then); images are centered on their page with
+    their aspect ratio kept, and each frame of a multi-page TIFF becomes a
+    page. Images larger than their page needs at ``image_dpi`` are decoded
+    at reduced resolution. PDFs are read through the shared ``sessions``
+    pool, so files already open elsewhere are not parsed again. ``progress(done, total)`` is called after each
+    input. With ``dedup``, resources repeated across inputs (fonts, logos,
+    ICC profiles) are collapsed into one copy before the result is written
+    with the given save profile (the "smallest" profile's save does this
+    itself). Errors are raised to the caller.
+    """
+    with metrics.measure("merge", output_path) as merging:
         merger = fitz.open()  # Empty document to merge into
-        
-        for pdf in file_paths:
-            pdf_document = fitz.open(pdf)
-            merger.insert_pdf(pdf_document)
-            pdf_document.close()
-        
-        merger.save(output_path)
-        merger.close()
+        page_size = None
+
+        try:
+            for done, file in enumerate(file_paths, start=1):
+                file_ext = _file_ext(file)
+                if file_ext == "pdf":
+                    with sessions.session(file) as session:
+                        if page_size is None and session.page_count:
+                            page_size = session.page_sizes()[0]
+                        with metrics.measure("insert", file) as measured:
+                            merger.insert_pdf(session.document)
+                            measured.nbytes = session.size
+                            measured.pages = session.page_count
+                elif file_ext in IMAGE_EXTENSIONS:
+                    if page_size is None:
+                        page_size = DEFAULT_PAGE_SIZE
+                    with metrics.measure("image", file) as measured:
+                        measured.pages = _insert_image_page(merger, file, page_size, image_dpi)
+                        measured.nbytes = os.path.getsize(file)
+                else:
+                    raise ValueError(f"Unsupported file type: {file}")
+
+                if progress is not None:
+                    progress(done, len(file_paths))
+
+            dedup_report = DedupReport()
+            # Saves with garbage=4 merge identical objects themselves; the pass would only cost time there
+            if dedup and SAVE_PROFILES[profile].get("garbage", 0) < 4:
+                with metrics.measure("dedup", output_path) as measured:
+                    dedup_report = deduplicate_resources(merger, SAVE_PROFILES[profile].get("deflate", False))
+                    measured.nbytes = dedup_report.bytes_saved
+            report = save_document(merger, output_path, profile)
+            report.objects_deduplicated = dedup_report.objects_merged
+            report.bytes_deduplicated = dedup_report.bytes_saved
+            merging.nbytes = report.size
+            merging.pages = report.page_count
+            return report
+        finally:
+            merger.close()
+
+
+def merge_files(file_paths: list[str], output_path: str, profile: str = DEFAULT_SAVE_PROFILE) -> None:
+    """Merge multiple PDF and image files into a single PDF file."""
+    try:
+        merge_inputs(file_paths, output_path, profile=profile)
     except Exception as e:
         print(f"Error merging PDFs: {e}")
+
+
+# Ways to split a document; see ``plan_split``
+SPLIT_RULES = ("pages", "ranges", "bookmarks")
+# Below this many pages, copying is quicker than starting a process pool
+PARALLEL_SPLIT_MIN_PAGES = 500
+_UNSAFE_FILENAME = re.compile(r'[\\/:*?"<>|\x00-\x1f]+')
+
+
+@dataclass
+class SplitPart:
+    """One output file of a split: the source pages (0-based, in order) and where they go."""
+
+    pages: list[int]
+    output_path: str
+    title: str | None = None  # bookmark title for bookmark splits
+
+
+def _bookmark_starts(pdf_document: fitz.Document, level: int) -> list[tuple[int, str]]:
+    """Return ``(first page, title)`` for each bookmark at ``level`` or above, in page order."""
+    starts = {}
+    for bookmark_level, title, page in pdf_document.get_toc(simple=True):
+        if bookmark_level <= level and 1 <= page <= pdf_document.page_count:
+            starts.setdefault(page - 1, title.strip())  # the first bookmark on a page names it
+    return sorted(starts.items())
+
+
+def plan_split(
+    file_path: str, rule: str, value, output_dir: str, prefix: str | None = None
+) -> list[SplitPart]:
+    """Work out the parts a split of ``file_path`` produces, without writing anything.
+
+    ``rule`` is one of ``SPLIT_RULES``:
+
+    * ``"pages"``: a new part every ``value`` pages.
+    * ``"ranges"``: ``value`` lists one 1-based range expression per part,
+      separated by ``;`` (``"1-10; 11-40,45; 46-"``) or given as a list.
+    * ``"bookmarks"``: a new part at each bookmark at outline level
+      ``value`` or above (default 1); pages before the first one form a
+      part of their own.
+
+    Parts are written to ``output_dir`` as ``<prefix>_001.pdf`` and so on,
+    with the bookmark title appended for bookmark splits; ``prefix``
+    defaults to the source file's name. Raises ValueError for an unknown
+    rule or a value that does not fit the document.
+    """
+    if rule not in SPLIT_RULES:
+        raise ValueError(f"Split rule must be one of {', '.join(SPLIT_RULES)}, got {rule!r}")
+    with open_document(file_path) as pdf_document:
+        page_count = pdf_document.page_count
+        titles = []
+        if rule == "pages":
+            try:
+                size = int(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"Pages per part must be a whole number, got {value!r}") from None
+            if size < 1:
+                raise ValueError("Pages per part must be at least 1")
+            page_lists = [list(range(first, min(first + size, page_count))) for first in range(0, page_count, size)]
+        elif rule == "ranges":
+            specs = value.split(";") if isinstance(value, str) else list(value)
+            page_lists = [parse_page_ranges(spec, page_count) for spec in specs if spec.strip()]
+        else:
+            try:
+                level = int(value or 1)
+            except (TypeError, ValueError):
+                raise ValueError(f"Bookmark level must be a whole number, got {value!r}") from None
+            if level < 1:
+                raise ValueError("Bookmark level must be at least 1")
+            starts = _bookmark_starts(pdf_document, level)
+            if not starts:
+                raise ValueError(f"No bookmarks at level {level} or above")
+            if starts[0][0] > 0:
+                starts.insert(0, (0, None))
+            bounds = [first for first, _ in starts] + [page_count]
+            page_lists = [list(range(first, last)) for first, last in zip(bounds, bounds[1:])]
+            titles = [title for _, title in starts]
+    if not any(page_lists):
+        raise ValueError("The split rule selects no pages")
+
+    prefix = prefix or os.path.splitext(os.path.basename(file_path))[0]
+    width = max(3, len(str(len(page_lists))))
+    parts = []
+    for number, pages in enumerate(page_lists, start=1):
+        title = titles[number - 1] if titles else None
+        name = f"{prefix}_{number:0{width}d}"
+        if title:
+            name += "_" + _UNSAFE_FILENAME.sub("_", title)[:60].strip(" ._")
+        parts.append(SplitPart(pages=pages, output_path=os.path.join(output_dir, name + ".pdf"), title=title))
+    return [part for part in parts if part.pages]
+
+
+def _page_runs(pages: list[int]):
+    """Group page indices into ``(first, last)`` runs of consecutive ascending pages."""
+    first = last = None
+    for page in pages:
+        if last is not None and page == last + 1:
+            last = page
+            continue
+        if first is not None:
+            yield first, last
+        first = last = page
+    if first is not None:
+        yield first, last
+
+
+def _write_part(source: fitz.Document, part: SplitPart, profile: str) -> SaveReport:
+    """Copy the pages of ``part`` from the open ``source`` into a new file."""
+    output = fitz.open()
+    try:
+        for first, last in _page_runs(part.pages):
+            output.insert_pdf(source, from_page=first, to_page=last)
+        return save_document(output, part.output_path, profile)
+    finally:
+        output.close()
+
+
+def _write_parts(parts: list[SplitPart], profile: str) -> list[SaveReport]:
+    """Worker: write each of ``parts`` from this process's copy of the source."""
+    return [_write_part(_worker_document, part, profile) for part in parts]
+
+
+def split_pdf(
+    file_path: str,
+    parts: list[SplitPart],
+    workers: int | None = None,
+    profile: str = DEFAULT_SAVE_PROFILE,
+    progress=None,
+) -> list[SaveReport]:
+    """Write each of ``parts`` (see ``plan_split``) as its own PDF and return their reports in order.
+
+    Each worker process opens the source once and copies whole page runs
+    from it into new files, so parts are written side by side instead of one
+    after another. Consecutive parts are handed out in batches of about the
+    same number of pages, several per worker so the load evens out.
+    ``progress(done, total)`` counts written parts. Splits of fewer than
+    ``PARALLEL_SPLIT_MIN_PAGES`` pages, or ``workers=1``, run in this
+    process. Errors are raised to the caller.
+    """
+    with metrics.measure("split", file_path) as splitting:
+        source = os.path.abspath(file_path)
+        for part in parts:
+            if os.path.abspath(part.output_path) == source:
+                raise ValueError(f"A part would overwrite the source file: {part.output_path}")
+        for directory in {os.path.dirname(os.path.abspath(part.output_path)) for part in parts}:
+            os.makedirs(directory, exist_ok=True)
+
+        total_pages = splitting.pages = sum(len(part.pages) for part in parts)
+        workers = workers or os.cpu_count() or 1
+        if workers <= 1 or len(parts) <= 1 or total_pages < PARALLEL_SPLIT_MIN_PAGES:
+            reports = []
+            with open_document(file_path) as pdf_document:
+                for part in parts:
+                    reports.append(_write_part(pdf_document, part, profile))
+                    if progress is not None:
+                        progress(len(reports), len(parts))
+            splitting.nbytes = sum(report.size for report in reports)
+            return reports
+
+        batch_pages = max(1, total_pages // (workers * 8))
+        batches = [[]]
+        pages_in_batch = 0
+        for index, part in enumerate(parts):
+            if pages_in_batch >= batch_pages:
+                batches.append([])
+                pages_in_batch = 0
+            batches[-1].append(index)
+            pages_in_batch += len(part.pages)
+
+        reports = [None] * len(parts)
+        done = 0
+        with _process_pool(min(workers, len(batches)), _open_worker_document, (file_path,)) as pool:
+            futures = {pool.submit(_write_parts, [parts[index] for index in batch], profile): batch for batch in batches}
+            for future in as_completed(futures):
+                for index, report in zip(futures[future], future.result()):
+                    reports[index] = report
+                done += len(futures[future])
+                if progress is not None:
+                    progress(done, len(parts))
+        splitting.nbytes = sum(report.size for report in reports)
+        return reports
+
+
+# Rough per-page overhead a merged input adds on top of its own bytes
+_PAGE_OVERHEAD = 600
+
+
+@dataclass
+class ProbeResult:
+    """What preflight learned about one merge input."""
+
+    path: str
+    ok: bool
+    error: str | None = None
+    page_count: int = 0
+    page_size: tuple[float, float] | None = None  # first page, in points
+    pixel_size: tuple[int, int] | None = None  # images only
+    encrypted: bool = False
+    file_size: int = 0
+    estimated_size: int = 0  # bytes this input is expected to add to the merged file
+
+
+def probe_file(file_path: str) -> ProbeResult:
+    """Check that a merge input can be read, without rendering or decoding it."""
+    result = ProbeResult(path=file_path, ok=False)
+    try:
+        result.file_size = os.path.getsize(file_path)
+        file_ext = _file_ext(file_path)
+        if file_ext == "pdf":
+            with open_document(file_path, result.file_size) as pdf_document:
+                result.encrypted = pdf_document.is_encrypted
+                if pdf_document.needs_pass:
+                    result.error = "Password protected"
+                    return result
+                result.page_count = pdf_document.page_count
+                if not result.page_count:
+                    result.error = "No pages"
+                    return result
+                result.page_size = (pdf_document[0].rect.width, pdf_document[0].rect.height)
+        elif file_ext in IMAGE_EXTENSIONS:
+            with Image.open(file_path) as img:
+                result.pixel_size = img.size
+                result.page_count = getattr(img, "n_frames", 1) if img.format in MULTI_FRAME_FORMATS else 1
+                img.verify()  # checks the file structure without decoding the pixels
+        else:
+            result.error = "Unsupported file type"
+            return result
+    except Exception as e:
+        result.error = str(e) or type(e).__name__
+        return result
+
+    result.ok = True
+    result.estimated_size = result.file_size + result.page_count * _PAGE_OVERHEAD
+    return result
+
+
+class Preflight:
+    """Probes merge inputs concurrently in worker processes and caches the results.
+
+    Results are cached per file version (path, size, mtime), so re-adding an
+    unchanged file is answered immediately. The process pool is started on
+    first use and kept until ``shutdown()``.
+    """
+
+    def __init__(self, workers: int | None = None):
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self._pool = None
+        self._cache: dict[tuple[str, int, int], ProbeResult] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(file_path: str) -> tuple[str, int, int] | None:
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns
+
+    def cached(self, file_path: str) -> ProbeResult | None:
+        """Return the cached result for the current version of ``file_path``, if any."""
+        key = self._key(file_path)
+        with self._lock:
+            return self._cache.get(key) if key else None
+
+    def probe(self, file_paths: list[str]):
+        """Yield a ProbeResult for each path as soon as it is available (cached ones first)."""
+        pending = {}
+        for file_path in dict.fromkeys(file_paths):
+            result = self.cached(file_path)
+            if result is not None:
+                yield result
+            elif self._key(file_path) is None:
+                yield ProbeResult(path=file_path, ok=False, error="File not found")
+            else:
+                pending[file_path] = None
+        if not pending:
+            return
+
+        with self._lock:
+            if self._pool is None:
+                from concurrent.futures import ProcessPoolExecutor
+
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            futures = [self._pool.submit(probe_file, file_path) for file_path in pending]
+        for future in as_completed(futures):
+            result = future.result()
+            key = self._key(result.path)
+            if key is not None:
+                with self._lock:
+                    self._cache[key] = result
+            yield result
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+
+# Pages are analysed at this size (stretched, aspect ignored), about 13 dpi on
+# US Letter: enough to see text lines, cheap enough for thousands of pages.
+ANALYSIS_SIZE = (128, 160)
+# Grid the thumbnail is averaged down to before the DCT; 16x16 lowest frequencies are hashed
+_HASH_GRID = 32
+_HASH_FREQS = 16
+# Pages are rendered once at this size (about 36 dpi on US Letter); the
+# thumbnail is shrunk from that render, and it also gives each page a
+# fingerprint: the mean grey of every 6x6 block after the page is scaled to
+# white paper and its ink centred, so a shifted rescan lines up with the
+# original. Rescans of one sheet stay within 9 grey levels in every block;
+# different statements on one form mostly differ by more somewhere.
+_CONFIRM_SIZE = (306, 396)
+_FINGERPRINT_BLOCK = 6
+_FINGERPRINT_MAX_DIFFERENCE = 10
+# Pages passing the fingerprint are rendered again, aligned to within a couple
+# of pixels and compared in 12x12 blocks; they differ when any block differs
+# by more than this mean grey level (rescans of one sheet stay near 4).
+_CONFIRM_SHIFT = 2
+_CONFIRM_BLOCK = 12
+_CONFIRM_MAX_DIFFERENCE = 6.0
+# Earlier pages compared this way, closest fingerprint first, before a page is taken as unique
+_CONFIRM_TRIES = 4
+
+
+@dataclass
+class PageAnalysis:
+    """Blank and near-duplicate pages found by ``analyze_pages`` (0-based source page numbers)."""
+
+    ink: np.ndarray  # fraction of each page covered by ink
+    hashes: np.ndarray  # 256-bit perceptual hash per page, packed into 32 bytes
+    blank: list[int]
+    duplicates: dict[int, int]  # page -> earlier page it duplicates
+
+    @property
+    def flagged(self) -> list[int]:
+        return sorted(set(self.blank) | set(self.duplicates))
+
+    def summary(self) -> str:
+        return f"{len(self.blank)} blank page(s), {len(self.duplicates)} near-duplicate page(s)"
+
+
+def _dct_matrix(n: int) -> np.ndarray:
+    k = np.arange(n)[:, None]
+    x = np.arange(n)[None, :]
+    return np.cos(np.pi * (2 * x + 1) * k / (2 * n)).astype(np.float32)
+
+
+def _measure_pages(thumbnails: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Return the ink coverage and the perceptual-hash grid of a batch of grayscale thumbnails."""
+    count, height, width = thumbnails.shape
+    # Ink is anything clearly different from the page's own paper colour, so grey
+    # or yellowed scans of empty sheets still come out blank, and light text on a
+    # dark or coloured page still counts
+    paper = np.percentile(thumbnails.reshape(count, -1), 90, axis=1)
+    ink = (np.abs(thumbnails - paper[:, None, None]) > 48).mean(axis=(1, 2))
+    grid = thumbnails.reshape(
+        count, _HASH_GRID, height // _HASH_GRID, _HASH_GRID, width // _HASH_GRID
+    ).mean(axis=(2, 4))
+    return ink, grid
+
+
+def _paper_level(img: Image.Image) -> int:
+    """Grey level of the paper in a grayscale render: its 90th percentile, at least 1."""
+    counts = np.cumsum(img.histogram())
+    return max(int(np.searchsorted(counts, 0.9 * counts[-1])), 1)
+
+
+def _fingerprint(img: Image.Image) -> np.ndarray:
+    """Mean grey of each 6x6 block of a grayscale render, scaled to white paper and with its ink centred.
+
+    The render fits within ``_CONFIRM_SIZE``; its ink is centred on a page of
+    that size, so every fingerprint has the same shape.
+    """
+    img = img.point(np.minimum(np.arange(256) * (255 / _paper_level(img)), 255).round().astype(np.uint8).tolist())
+    weights = np.asarray(img.point(np.maximum(207 - np.arange(256), 0).tolist()))  # ink, as in _measure_pages
+    height, width = weights.shape
+    total = int(weights.sum(dtype=np.int64))
+    y = weights.sum(axis=1, dtype=np.int64) @ np.arange(height) / total if total else height / 2
+    x = weights.sum(axis=0, dtype=np.int64) @ np.arange(width) / total if total else width / 2
+    # Blur, so that resampling at different sub-pixel offsets changes block means little
+    pixels = np.asarray(img.filter(ImageFilter.BoxBlur(2)))
+
+    # Shift by the offset from the page centre, whole pixels first, then the fraction bilinearly
+    page_width, page_height = _CONFIRM_SIZE
+    dy, dx = y - page_height / 2, x - page_width / 2
+    iy, ix = math.floor(dy), math.floor(dx)
+    fy, fx = dy - iy, dx - ix
+    shifted = np.full((page_height + 1, page_width + 1), 255, dtype=np.float32)
+    top, left = max(-iy, 0), max(-ix, 0)
+    bottom, right = min(page_height + 1, height - iy), min(page_width + 1, width - ix)
+    if bottom > top and right > left:
+        shifted[top:bottom, left:right] = pixels[top + iy : bottom + iy, left + ix : right + ix]
+    rows = shifted[1:] - shifted[:-1]
+    rows *= fy
+    rows += shifted[:-1]
+    shifted = rows[:, 1:] - rows[:, :-1]
+    shifted *= fx
+    shifted += rows[:, :-1]
+    blocks = Image.fromarray(shifted, "F").reduce(_FINGERPRINT_BLOCK)
+    return np.asarray(blocks).round().astype(np.uint8)
+
+
+def _perceptual_hashes(grids: np.ndarray) -> np.ndarray:
+    """DCT-based perceptual hash: one bit per low frequency, set when above that page's median."""
+    dct = _dct_matrix(_HASH_GRID)[:_HASH_FREQS]
+    coefficients = (dct @ grids @ dct.T).reshape(len(grids), -1)
+    # The DC term only measures overall brightness, so it is left out of the median
+    bits = coefficients > np.median(coefficients[:, 1:], axis=1, keepdims=True)
+    return np.packbits(bits, axis=1)
+
+
+def _block_difference(a: np.ndarray, b: np.ndarray) -> float:
+    """Largest mean difference of any block of two renders, at the best offset between them."""
+    height, width = a.shape
+    r = _CONFIRM_SHIFT
+    inner = b[r : height - r, r : width - r]
+    # Every third row is enough to pick the offset
+    offset = min(
+        ((dy, dx) for dy in range(-r, r + 1) for dx in range(-r, r + 1)),
+        key=lambda d: np.abs(a[r + d[0] : height - r + d[0] : 3, r + d[1] : width - r + d[1]] - inner[::3]).mean(),
+    )
+    diff = np.abs(a[r + offset[0] : height - r + offset[0], r + offset[1] : width - r + offset[1]] - inner)
+    rows, cols = diff.shape[0] // _CONFIRM_BLOCK, diff.shape[1] // _CONFIRM_BLOCK
+    blocks = diff[: rows * _CONFIRM_BLOCK, : cols * _CONFIRM_BLOCK].reshape(rows, _CONFIRM_BLOCK, cols, _CONFIRM_BLOCK)
+    return float(blocks.mean(axis=(1, 3)).max())
+
+
+class _PageComparer:
+    """Decides whether two pages whose hashes match really show the same thing.
+
+    Only earlier pages whose fingerprints are within
+    ``_FINGERPRINT_MAX_DIFFERENCE`` are compared, closest first. Those with
+    the same text (or none, as on scans) are rendered again and compared block
+    by block. Recent renders are cached, since a page is often compared
+    several times.
+    """
+
+    def __init__(self, pdf_document: fitz.Document, fingerprints: np.ndarray, cache_size: int = 64):
+        self.document = pdf_document
+        self._fingerprints = fingerprints.reshape(len(fingerprints), -1)
+        self._texts: dict[int, str] = {}
+        self._renders: OrderedDict[int, np.ndarray] = OrderedDict()
+        self._cache_size = cache_size
+
+    def closest(self, page: int, others: np.ndarray) -> np.ndarray:
+        """Up to ``_CONFIRM_TRIES`` pages of ``others`` within the fingerprint difference, closest first."""
+        fingerprint, candidates = self._fingerprints[page], self._fingerprints[others]
+        # The larger minus the smaller, as unsigned bytes cannot go negative
+        differences = (np.maximum(candidates, fingerprint) - np.minimum(candidates, fingerprint)).max(axis=1)
+        order = np.argsort(differences, kind="stable")
+        return others[order[differences[order] <= _FINGERPRINT_MAX_DIFFERENCE]][:_CONFIRM_TRIES]
+
+    def _text(self, page_num: int) -> str:
+        if page_num not in self._texts:
+            self._texts[page_num] = " ".join(self.document.load_page(page_num).get_text().split())
+        return self._texts[page_num]
+
+    def _render(self, page_num: int) -> np.ndarray:
+        pixels = self._renders.get(page_num)
+        if pixels is not None:
+            self._renders.move_to_end(page_num)
+            return pixels
+        img = render_page(self.document.load_page(page_num), _CONFIRM_SIZE, grayscale=True)
+        if img.size != _CONFIRM_SIZE:
+            img = img.resize(_CONFIRM_SIZE, Image.Resampling.BILINEAR)
+        img = img.filter(ImageFilter.BoxBlur(1))
+        # Scale to white paper, so a darker rescan of the same sheet still matches
+        pixels = np.minimum(np.asarray(img, dtype=np.float32) * (255 / _paper_level(img)), 255)
+        self._renders[page_num] = pixels
+        if len(self._renders) > self._cache_size:
+            self._renders.popitem(last=False)
+        return pixels
+
+    def same(self, page: int, other: int) -> bool:
+        if self._text(page) != self._text(other):
+            return False
+        if np.array_equal(self._fingerprints[page], self._fingerprints[other]):
+            return True  # the same render, as for a page included twice
+        return _block_difference(self._render(page), self._render(other)) <= _CONFIRM_MAX_DIFFERENCE
+
+
+def _find_duplicates(
+    hashes: np.ndarray, candidates: np.ndarray, max_distance: int, comparer=None, block: int = 256
+) -> dict[int, int]:
+    """Map each candidate page to an earlier kept page whose hash is within ``max_distance`` bits.
+
+    With a ``comparer`` (see ``_PageComparer``), the closest of those by
+    fingerprint that it finds the same is taken; without it, the first page
+    within the distance is.
+    """
+    duplicates = {}
+    kept = candidates.copy()  # pages later pages may be matched against
+    for start in range(0, len(hashes), block):
+        rows = hashes[start : start + block]
+        distances = np.bitwise_count(rows[:, None, :] ^ hashes[None, :, :]).sum(axis=2, dtype=np.uint16)
+        for offset, row in enumerate(distances):
+            page = start + offset
+            if not candidates[page]:
+                continue
+            matches = np.flatnonzero((row[:page] <= max_distance) & kept[:page])
+            if not len(matches):
+                continue
+            matches = matches[:1] if comparer is None else comparer.closest(page, matches)
+            for other in matches.tolist():
+                if comparer is None or comparer.same(page, other):
+                    duplicates[page] = other
+                    kept[page] = False
+                    break
+    return duplicates
+
+
+def analyze_pages(
+    file_path: str,
+    blank_ink: float = 0.0002,
+    duplicate_distance: int = 32,
+    progress=None,
+    batch_size: int = 256,
+) -> PageAnalysis:
+    """Flag blank and near-duplicate pages of a PDF.
+
+    Pages are rendered once in grayscale (``_CONFIRM_SIZE``, in parallel for
+    large files), shrunk to thumbnails (``ANALYSIS_SIZE``) and measured in
+    batches with NumPy. A page is blank when at most ``blank_ink`` of it is
+    covered by ink; a non-blank page is a near-duplicate of an earlier page
+    whose perceptual hash differs in at most ``duplicate_distance`` of 256
+    bits, and whose fingerprint, text and larger render match it too: form
+    pages such as statements share a layout and hash alike even when their
+    figures differ. ``progress(done, total)`` is called as pages are
+    rendered.
+    """
+    with sessions.session(file_path) as session:
+        page_count = session.page_count
+    ink = np.empty(page_count, dtype=np.float32)
+    grids = np.empty((page_count, _HASH_GRID, _HASH_GRID), dtype=np.float32)
+    fingerprints = np.empty(
+        (page_count, _CONFIRM_SIZE[1] // _FINGERPRINT_BLOCK, _CONFIRM_SIZE[0] // _FINGERPRINT_BLOCK), dtype=np.uint8
+    )
+
+    batch = []
+    for page_num, img in render_pages(file_path, size=_CONFIRM_SIZE, grayscale=True):
+        batch.append(np.asarray(img.resize(ANALYSIS_SIZE, Image.Resampling.BILINEAR), dtype=np.float32))
+        fingerprints[page_num] = _fingerprint(img)
+        if len(batch) == batch_size or page_num == page_count - 1:
+            first = page_num + 1 - len(batch)
+            ink[first : page_num + 1], grids[first : page_num + 1] = _measure_pages(np.stack(batch))
+            batch.clear()
+        if progress is not None:
+            progress(page_num + 1, page_count)
+
+    hashes = _perceptual_hashes(grids)
+    is_blank = ink <= blank_ink
+    with sessions.session(file_path) as session:
+        comparer = _PageComparer(session.document, fingerprints)
+        duplicates = _find_duplicates(hashes, ~is_blank, duplicate_distance, comparer)
+    return PageAnalysis(
+        ink=ink,
+        hashes=hashes,
+        blank=np.flatnonzero(is_blank).tolist(),
+        duplicates=duplicates,
+    )
+
+
+_WORD = re.compile(r"\w+")
+# Pages of text extracted per worker task while indexing
+TEXT_INDEX_CHUNK = 32
+# Documents with fewer pages are indexed in-process; a pool would take longer to start
+PARALLEL_INDEX_MIN_PAGES = 64
+
+
+def page_words(text: str) -> list[str]:
+    """Return the distinct lower-cased words in ``text``, as the index stores them."""
+    return sorted(set(_WORD.findall(text.lower())))
+
+
+class TextIndex:
+    """Inverted index from words to the source pages they appear on.
+
+    Pages are added incrementally, and searches may run on another thread
+    meanwhile; they see the pages indexed so far. Matching ignores case,
+    every word of a query must be on the page, and the last word also
+    matches longer words it starts, so results follow the user's typing.
+    """
+
+    def __init__(self, page_count: int = 0):
+        self.page_count = page_count
+        self._postings: dict[str, set[int]] = {}
+        self._indexed: set[int] = set()
+        self._vocabulary: list[str] | None = None  # sorted words, rebuilt after additions
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._indexed)
+
+    @property
+    def complete(self) -> bool:
+        return len(self._indexed) >= self.page_count
+
+    def __contains__(self, page_num: int) -> bool:
+        return page_num in self._indexed
+
+    def add(self, page_num: int, words: list[str]) -> None:
+        """Index the words (see ``page_words``) found on a page."""
+        with self._lock:
+            for word in words:
+                self._postings.setdefault(word, set()).add(page_num)
+            self._indexed.add(page_num)
+            self._vocabulary = None
+
+    def search(self, query: str) -> list[int]:
+        """Return the source pages matching ``query`` in page order."""
+        *words, last = _WORD.findall(query.lower()) or [None]
+        if last is None:
+            return []
+        with self._lock:
+            if self._vocabulary is None:
+                self._vocabulary = sorted(self._postings)
+            vocabulary = self._vocabulary
+            matches = set()
+            position = bisect.bisect_left(vocabulary, last)
+            while position < len(vocabulary) and vocabulary[position].startswith(last):
+                matches |= self._postings[vocabulary[position]]
+                position += 1
+            for word in words:
+                matches &= self._postings.get(word, set())
+        return sorted(matches)
+
+
+def _document_words(pdf_document: fitz.Document, page_nums: list[int]) -> dict[int, list[str]]:
+    """Return the words on each of ``page_nums``."""
+    with metrics.measure("text", pdf_document.name) as measured:
+        found = {page_num: page_words(pdf_document.load_page(page_num).get_text()) for page_num in page_nums}
+        measured.pages = len(found)
+    return found
+
+
+def _extract_page_words(page_nums: list[int]) -> dict[int, list[str]]:
+    """Worker: return the words on each of ``page_nums`` of this process's copy of the document."""
+    return _document_words(_worker_document, page_nums)
+
+
+def build_text_index(
+    file_path: str, index: TextIndex, disk_cache=None, progress=None, workers: int | None = None
+) -> TextIndex:
+    """Fill ``index``, created with the document's page count, with the words on every page of ``file_path``.
+
+    Pages already stored in ``disk_cache`` (see ``page_cache.PageCache``)
+    are added first. The rest are extracted in worker processes (two at
+    most by default, to leave the GUI a core) and each chunk is added and
+    written back to the cache as it arrives, so search works while this
+    runs. Only the workers open the file, so this may run beside a thread
+    that is using PyMuPDF. Documents of fewer than
+    ``PARALLEL_INDEX_MIN_PAGES`` pages, or ``workers=1``, are read in this
+    process through ``sessions`` instead, so call this from the thread
+    that runs the document jobs then. ``progress(done, total)`` counts
+    indexed pages.
+    """
+    page_count = index.page_count
+    doc_key = disk_cache.key_for(file_path) if disk_cache is not None else None
+
+    if disk_cache is not None:
+        try:
+            for page_num, words in disk_cache.get_page_words(doc_key).items():
+                index.add(page_num, words)
+        except Exception as e:
+            print(f"Error reading page index: {e}")
+    if progress is not None:
+        progress(len(index), page_count)
+
+    missing = [page_num for page_num in range(page_count) if page_num not in index]
+    if not missing:
+        return index
+
+    def add(found: dict[int, list[str]]) -> None:
+        for page_num, words in found.items():
+            index.add(page_num, words)
+        if disk_cache is not None:
+            try:
+                disk_cache.put_page_words(doc_key, found)
+            except Exception as e:
+                print(f"Error writing page index: {e}")
+        if progress is not None:
+            progress(len(index), page_count)
+
+    chunks = [missing[i : i + TEXT_INDEX_CHUNK] for i in range(0, len(missing), TEXT_INDEX_CHUNK)]
+    # Decided by the page count alone, so callers know which thread they may call this from
+    if workers == 1 or page_count < PARALLEL_INDEX_MIN_PAGES:
+        with sessions.session(file_path) as session:
+            for chunk in chunks:
+                add(_document_words(session.document, chunk))
+        return index
+
+    workers = min(workers or min(2, os.cpu_count() or 1), len(chunks))
+    with _process_pool(workers, _open_worker_document, (file_path,)) as pool:
+        for future in as_completed([pool.submit(_extract_page_words, chunk) for chunk in chunks]):
+            add(future.result())
+    return index
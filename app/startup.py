@@ -0,0 +1,152 @@
+"""Cold-start helpers: deferred imports and the startup-timing report.
+
+``LazyModule`` stands in for a heavy module until an attribute is first
+used, so importing pdf_tools does not pay for PyMuPDF and NumPy before the
+window is up. ``timer`` records how long each import took and when the
+main window was built and first painted. Run the GUI with
+``--startup-report`` to print the report, or ``--startup-report=FILE``
+(or the ``PDF_TOOLKIT_STARTUP_REPORT`` environment variable) to write it
+as JSON, which also works for the windowed frozen build.
+"""
+import builtins
+import json
+import os
+import platform
+import sys
+import threading
+import time
+
+REPORT_ENV = "PDF_TOOLKIT_STARTUP_REPORT"
+
+
+class LazyModule:
+    """A module that is imported by ``loader()`` on first attribute access.
+
+    The loader should contain a plain ``import`` statement (rather than
+    ``importlib``), so PyInstaller still finds and bundles the module.
+    """
+
+    def __init__(self, loader):
+        self._loader = loader
+        self._module = None
+
+    def _resolve(self):
+        if self._module is None:
+            self._module = self._loader()  # the import system serializes concurrent loads
+        return self._module
+
+    def __getattr__(self, name):
+        return getattr(self._resolve(), name)
+
+
+def preload(*modules: LazyModule) -> None:
+    """Import lazily loaded modules now, e.g. from a background thread."""
+    for module in modules:
+        module._resolve()
+
+
+class StartupTimer:
+    """Records import durations and named milestones, in seconds since it was created."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.marks: list[tuple[str, float]] = []
+        self.imports: list[tuple[int, str, float]] = []  # (nesting depth, module, seconds)
+        self._import = None
+        self._depth = 0
+        self._lock = threading.Lock()
+
+    def mark(self, label: str) -> None:
+        with self._lock:
+            self.marks.append((label, time.perf_counter() - self.start))
+
+    def watch_imports(self) -> None:
+        """Time every import that loads new modules until ``stop_watching()``."""
+        if self._import is None:
+            self._import = builtins.__import__
+            builtins.__import__ = self._timed_import
+
+    def stop_watching(self) -> None:
+        if self._import is not None:
+            builtins.__import__ = self._import
+            self._import = None
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        original = self._import or builtins.__import__
+        if not level and not fromlist and name in sys.modules:
+            return original(name, globals, locals, fromlist, level)
+        label = _module_label(name, globals, fromlist, level)
+        loaded = len(sys.modules)
+        self._depth += 1
+        start = time.perf_counter()
+        try:
+            return original(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            self._depth -= 1
+            if len(sys.modules) > loaded:
+                self.imports.append((self._depth, label, elapsed))
+
+    def as_dict(self) -> dict:
+        return {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "frozen": bool(getattr(sys, "frozen", False)),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "marks": {label: round(seconds * 1000, 1) for label, seconds in self.marks},
+            "imports": [
+                {"module": label, "depth": depth, "ms": round(seconds * 1000, 1)} for depth, label, seconds in self.imports
+            ],
+        }
+
+    def text(self, slowest: int = 15) -> str:
+        lines = ["Startup timing (ms since launch):"]
+        lines += [f"  {label:<24} {seconds * 1000:8.1f}" for label, seconds in self.marks]
+        lines.append("Imports made by the app itself (cumulative ms):")
+        lines += [f"  {label:<40} {seconds * 1000:8.1f}" for depth, label, seconds in self.imports if depth == 0]
+        lines.append(f"Slowest {slowest} imports (cumulative ms):")
+        ranked = sorted(self.imports, key=lambda entry: entry[2], reverse=True)[:slowest]
+        lines += [f"  {label:<40} {seconds * 1000:8.1f}" for depth, label, seconds in ranked]
+        return "\n".join(lines)
+
+
+def _module_label(name: str, globals: dict | None, fromlist, level: int) -> str:
+    """Name an import for the report, e.g. ``PIL (Image, ImageTk)`` or ``pdf_tools``."""
+    if level:
+        package = (globals or {}).get("__package__") or ""
+        base = package.rsplit(".", level - 1)[0] if level > 1 else package
+        name = ".".join(part for part in (base, name) if part)
+    if fromlist:
+        names = list(fromlist)
+        name += f" ({', '.join(names[:3])}{', …' if len(names) > 3 else ''})"
+    return name
+
+
+def report_destination(argv: list[str] | None = None) -> str | None:
+    """Return "-" to print the report, a file path to write it as JSON, or None if it was not asked for."""
+    for arg in sys.argv[1:] if argv is None else argv:
+        if arg == "--startup-report":
+            return "-"
+        if arg.startswith("--startup-report="):
+            return arg.split("=", 1)[1]
+    destination = os.environ.get(REPORT_ENV) or None
+    return "-" if destination == "1" else destination
+
+
+def write_report(startup_timer: StartupTimer, destination: str | None = None) -> None:
+    """Print or save the report if one was requested."""
+    destination = destination or report_destination()
+    if destination is None:
+        return
+    if destination == "-":
+        print(startup_timer.text())
+        return
+    try:
+        with open(destination, "w", encoding="utf-8") as f:
+            json.dump(startup_timer.as_dict(), f, indent=2)
+    except OSError as e:
+        print(f"Could not write startup report: {e}")
+
+
+# Created when main.py starts, before its heavy imports
+timer = StartupTimer()
@@ -0,0 +1,247 @@
+import math
+import tkinter as tk
+
+from PIL import Image, ImageTk
+import ttkbootstrap as tb
+
+try:
+    from . import jobs, pdf_tools
+except ImportError:
+    import jobs, pdf_tools
+
+THUMB_SIZE = pdf_tools.RENDER_TIERS["thumbnail"]
+CELL_WIDTH = THUMB_SIZE[0] + 16
+CELL_HEIGHT = THUMB_SIZE[1] + 30
+
+
+class _Cell:
+    """One recycled thumbnail slot: a frame on the canvas with a fixed-size PhotoImage."""
+
+    def __init__(self, strip):
+        canvas = strip.canvas
+        background = strip._colors["normal"]
+        self.index = None
+        self.loaded = False  # whether the photo shows the page's thumbnail yet
+        self.photo = ImageTk.PhotoImage("RGB", THUMB_SIZE)
+        self.frame = tk.Frame(canvas, bd=0, highlightthickness=2, bg=background)
+        self.image = tk.Label(self.frame, image=self.photo, bd=0, bg=background)
+        self.image.pack(padx=2, pady=(2, 0))
+        self.caption = tk.Label(self.frame, font=("TkDefaultFont", 8), bg=background, fg=strip._colors["text"])
+        self.caption.pack(fill="x")
+        self.window = canvas.create_window(0, 0, window=self.frame, anchor="nw", state="hidden")
+        for widget in (self.frame, self.image, self.caption):
+            widget.bind("<Button-1>", lambda e: strip._click(self, "set"))
+            widget.bind("<Control-Button-1>", lambda e: strip._click(self, "toggle"))
+            widget.bind("<Shift-Button-1>", lambda e: strip._click(self, "extend"))
+            strip._bind_wheel(widget)
+
+
+class ThumbnailStrip(tb.Frame):
+    """Scrollable grid of page thumbnails that only renders the rows on screen.
+
+    Widgets and PhotoImages exist for the visible rows plus ``prefetch`` rows
+    above and below, and are reassigned to other pages while scrolling, so
+    the number of Tk objects depends on the window size, not the document.
+    Missing thumbnails are rendered by a single background job at a time,
+    which is replaced whenever the visible rows change. Clicking a page
+    selects it and calls ``on_activate(index)``; Ctrl- and Shift-click
+    build a multi-page selection (see ``selected()``).
+    """
+
+    def __init__(
+        self,
+        master,
+        pages: pdf_tools.PageSequence,
+        scheduler: jobs.JobScheduler,
+        on_activate=None,
+        columns: int = 2,
+        prefetch: int = 2,
+    ):
+        super().__init__(master)
+        self.pages = pages
+        self.scheduler = scheduler
+        self.on_activate = on_activate
+        self.columns = columns
+        self.prefetch = prefetch
+        self.current: int | None = None
+        self._selection: set[int] = set()
+        self._anchor: int | None = None
+        self._cells: list[_Cell] = []
+        self._version = None
+        self._job = None
+        self._pending: list[int] = []  # pages the current render job was asked for
+
+        colors = tb.Style().colors
+        self._colors = {"selected": colors.primary, "current": colors.info, "normal": colors.bg, "text": colors.fg}
+        self._placeholder = Image.new("RGB", THUMB_SIZE, colors.light)
+
+        self.canvas = tk.Canvas(
+            self, width=columns * CELL_WIDTH, bg=colors.bg, highlightthickness=0, yscrollincrement=CELL_HEIGHT // 4
+        )
+        scrollbar = tb.Scrollbar(self, orient="vertical", command=self._yview)
+        self.canvas.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side="right", fill="y")
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.canvas.bind("<Configure>", lambda e: self.refresh())
+        self._bind_wheel(self.canvas)
+
+    # ----------------------- Public API -----------------------
+
+    def selected(self) -> list[int]:
+        """Return the selected page indices in ascending order."""
+        return sorted(self._selection)
+
+    def see(self, index: int | None) -> None:
+        """Mark ``index`` as the current page and scroll it into view."""
+        self.current = index
+        self.refresh()
+        if index is None or not self._cells:
+            return
+        row = index // self.columns
+        top = self.canvas.canvasy(0)
+        bottom = top + self.canvas.winfo_height()
+        if row * CELL_HEIGHT < top or (row + 1) * CELL_HEIGHT > bottom:
+            rows = max(1, math.ceil(len(self.pages) / self.columns))
+            self.canvas.yview_moveto(row / rows)
+            self.refresh()
+
+    def refresh(self) -> None:
+        """Lay out the visible rows, reusing cells, and queue rendering of missing thumbnails."""
+        if self.pages.version != self._version:
+            # Different document or pages removed: every index may now mean another page
+            self._version = self.pages.version
+            self._selection.clear()
+            self._anchor = None
+            for cell in self._cells:
+                cell.index = None
+            self.canvas.yview_moveto(0)
+
+        count = len(self.pages)
+        rows = math.ceil(count / self.columns)
+        self.canvas.configure(scrollregion=(0, 0, self.columns * CELL_WIDTH, rows * CELL_HEIGHT))
+
+        top = self.canvas.canvasy(0)
+        height = max(self.canvas.winfo_height(), CELL_HEIGHT)
+        visible = range(int(top // CELL_HEIGHT) * self.columns, int((top + height) // CELL_HEIGHT + 1) * self.columns)
+        first_row = max(0, int(top // CELL_HEIGHT) - self.prefetch)
+        last_row = min(rows, int((top + height) // CELL_HEIGHT) + 1 + self.prefetch)
+        # Enough cells for a full viewport; this only grows when the window does
+        capacity = (math.ceil(height / CELL_HEIGHT) + 1 + 2 * self.prefetch) * self.columns
+        while len(self._cells) < capacity:
+            self._cells.append(_Cell(self))
+
+        wanted = range(first_row * self.columns, min(count, last_row * self.columns))
+        # Keep cells that already show a wanted page; hand the rest to the new pages
+        by_index = {cell.index: cell for cell in self._cells if cell.index in wanted}
+        spare = iter([cell for cell in self._cells if cell.index not in by_index])
+        missing = []
+        for index in wanted:
+            cell = by_index.get(index)
+            if cell is None:
+                cell = next(spare)
+                self._assign(cell, index)
+            if not cell.loaded:
+                missing.append(index)
+            row, column = divmod(index, self.columns)
+            self.canvas.coords(cell.window, column * CELL_WIDTH + 4, row * CELL_HEIGHT + 4)
+            self.canvas.itemconfigure(cell.window, state="normal")
+            self._style(cell)
+        for cell in spare:
+            cell.index = None
+            self.canvas.itemconfigure(cell.window, state="hidden")
+
+        if missing:
+            # Pages on screen first, then the prefetch rows
+            missing.sort(key=lambda index: index not in visible)
+            self._render(missing)
+
+    # ----------------------- Internals -----------------------
+
+    def _assign(self, cell: _Cell, index: int) -> None:
+        """Point ``cell`` at page ``index``, showing its thumbnail if it is already cached."""
+        cell.index = index
+        cell.caption.configure(text=str(index + 1))
+        self._paste(cell, self.pages.cached(index, "thumbnail"))
+
+    def _paste(self, cell: _Cell, img: Image.Image | None) -> None:
+        cell.loaded = img is not None
+        if img is None:
+            cell.photo.paste(self._placeholder)
+            return
+        # Thumbnails fit inside THUMB_SIZE; center them on a white box of exactly that size
+        box = Image.new("RGB", THUMB_SIZE, "white")
+        box.paste(img.convert("RGB"), ((THUMB_SIZE[0] - img.width) // 2, (THUMB_SIZE[1] - img.height) // 2))
+        cell.photo.paste(box)
+
+    def _render(self, indices: list[int]) -> None:
+        if self._job is not None and not self._job.finished:
+            if set(indices) <= set(self._pending):
+                return  # already being rendered
+            self._job.cancel()  # the visible rows changed
+        self._pending = indices
+        version = self.pages.version
+
+        def render(job):
+            for index in indices:
+                job.check_cancelled()
+                if self.pages.version != version:
+                    return
+                try:
+                    img = self.pages.get(index, "thumbnail")
+                except IndexError:
+                    return  # pages were removed meanwhile; a new job follows the refresh
+                job.post(self._show_thumbnail, version, index, img)
+
+        self._job = self.scheduler.submit("Rendering thumbnails", render, priority=0)
+
+    def _show_thumbnail(self, version: int, index: int, img: Image.Image) -> None:
+        if version != self.pages.version:
+            return
+        for cell in self._cells:
+            if cell.index == index:
+                self._paste(cell, img)
+
+    def _style(self, cell: _Cell) -> None:
+        if cell.index in self._selection:
+            color = self._colors["selected"]
+        elif cell.index == self.current:
+            color = self._colors["current"]
+        else:
+            color = self._colors["normal"]
+        cell.frame.configure(highlightbackground=color, highlightcolor=color)
+
+    def _click(self, cell: _Cell, mode: str) -> None:
+        index = cell.index
+        if index is None:
+            return
+        self.canvas.focus_set()
+        if mode == "toggle":
+            self._selection ^= {index}
+            self._anchor = index
+        elif mode == "extend" and self._anchor is not None:
+            low, high = sorted((self._anchor, index))
+            self._selection = set(range(low, high + 1))
+        else:
+            self._selection = {index}
+            self._anchor = index
+        for other in self._cells:
+            if other.index is not None:
+                self._style(other)
+        if self.on_activate is not None:
+            self.on_activate(index)
+
+    def _yview(self, *args) -> None:
+        self.canvas.yview(*args)
+        self.refresh()
+
+    def _bind_wheel(self, widget) -> None:
+        widget.bind("<MouseWheel>", self._on_wheel)  # Windows, macOS
+        widget.bind("<Button-4>", lambda e: self._scroll(-1))  # X11
+        widget.bind("<Button-5>", lambda e: self._scroll(1))
+
+    def _on_wheel(self, event) -> None:
+        self._scroll(-1 if event.delta > 0 else 1)
+
+    def _scroll(self, direction: int) -> None:
+        self.canvas.yview_scroll(direction * 2, "units")
+        self.refresh()
@@ -0,0 +1,25 @@
+import os
+import sys
+
+import fitz  # PyMuPDF
+import pytest
+
+# Import the app as a package, as ``python -m app.bench`` does
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def make_pdf(tmp_path):
+    """Return a function writing a PDF whose pages read "Page 1", "Page 2", ... and returning its path."""
+
+    def make(page_count: int, name: str = "input.pdf") -> str:
+        path = str(tmp_path / name)
+        pdf_document = fitz.open()
+        for page_num in range(page_count):
+            pdf_document.new_page().insert_text((72, 72), f"Page {page_num + 1}")
+        pdf_document.save(path)
+        pdf_document.close()
+        return path
+
+    return make
+
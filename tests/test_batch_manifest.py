@@ -0,0 +1,102 @@
+import json
+import os
+
+import pytest
+
+from app import batch, pdf_tools
+
+
+def write_manifest(tmp_path, jobs, name: str = "jobs.json") -> str:
+    path = tmp_path / name
+    path.write_text(json.dumps(jobs), encoding="utf-8")
+    return str(path)
+
+
+def test_json_manifest(tmp_path):
+    path = write_manifest(
+        tmp_path,
+        {
+            "jobs": [
+                {"action": "merge", "inputs": ["a.pdf", "b.png"], "output": "out/ab.pdf"},
+                {"id": "trim", "action": "Remove", "inputs": "a.pdf", "pages": [1, "3-4"], "output": "trim.pdf", "profile": "smallest"},
+            ]
+        },
+    )
+    merge, remove = batch.load_manifest(path)
+    assert merge.id == "1"
+    assert merge.inputs == [str(tmp_path / "a.pdf"), str(tmp_path / "b.png")]
+    assert merge.output == str(tmp_path / "out" / "ab.pdf")
+    assert merge.pages is None
+    assert merge.profile == pdf_tools.DEFAULT_SAVE_PROFILE
+    assert (remove.id, remove.action, remove.pages, remove.profile) == ("trim", "remove", "1,3-4", "smallest")
+
+
+def test_csv_manifest(tmp_path):
+    path = tmp_path / "jobs.csv"
+    path.write_text("id,action,inputs,pages,output\nm,merge,a.pdf;b.pdf,,ab.pdf\nr,remove,a.pdf,2-,a_short.pdf\n", encoding="utf-8")
+    merge, remove = batch.load_manifest(str(path))
+    assert merge.inputs == [str(tmp_path / "a.pdf"), str(tmp_path / "b.pdf")]
+    assert remove.pages == "2-"
+
+
+@pytest.mark.parametrize("pages, expected", [(3, "3"), ("1-2", "1-2"), ([2, 5], "2,5")])
+def test_pages(tmp_path, pages, expected):
+    path = write_manifest(tmp_path, [{"action": "remove", "inputs": ["a.pdf"], "pages": pages, "output": "b.pdf"}])
+    assert batch.load_manifest(path)[0].pages == expected
+
+
+@pytest.mark.parametrize(
+    "job",
+    [
+        {"action": "split", "inputs": ["a.pdf"], "output": "b.pdf"},
+        {"action": "merge", "inputs": [], "output": "b.pdf"},
+        {"action": "merge", "inputs": ["a.pdf"]},
+        {"action": "merge", "inputs": ["a.pdf"], "output": "b.pdf", "profile": "tiny"},
+        {"action": "remove", "inputs": ["a.pdf", "b.pdf"], "pages": "1", "output": "c.pdf"},
+        {"action": "remove", "inputs": ["a.pdf"], "output": "b.pdf"},
+        {"action": "remove", "inputs": ["a.pdf"], "pages": True, "output": "b.pdf"},
+        {"action": "remove", "inputs": ["a.pdf"], "pages": 1.5, "output": "b.pdf"},
+        {"action": "remove", "inputs": ["a.pdf"], "pages": [1, None], "output": "b.pdf"},
+        {"action": "remove", "inputs": ["a.pdf"], "pages": {"from": 1}, "output": "b.pdf"},
+        {"action": "merge", "inputs": ["a.pdf", "b.pdf"], "output": "./b.pdf"},
+    ],
+)
+def test_invalid_job(tmp_path, job):
+    with pytest.raises(ValueError):
+        batch.load_manifest(write_manifest(tmp_path, [job]))
+
+
+def test_jobs_must_not_share_outputs(tmp_path):
+    path = write_manifest(
+        tmp_path,
+        [
+            {"action": "merge", "inputs": ["a.pdf"], "output": "out.pdf"},
+            {"action": "merge", "inputs": ["b.pdf"], "output": os.path.join("sub", "..", "out.pdf")},
+        ],
+    )
+    with pytest.raises(ValueError, match="both write"):
+        batch.load_manifest(path)
+
+
+def test_jobs_must_not_read_other_outputs(tmp_path):
+    path = write_manifest(
+        tmp_path,
+        [
+            {"action": "merge", "inputs": ["a.pdf"], "output": "b.pdf"},
+            {"action": "merge", "inputs": ["b.pdf"], "output": "c.pdf"},
+        ],
+    )
+    with pytest.raises(ValueError, match="which job 1 writes"):
+        batch.load_manifest(path)
+
+
+def test_duplicate_ids(tmp_path):
+    path = write_manifest(
+        tmp_path,
+        [
+            {"id": "x", "action": "merge", "inputs": ["a.pdf"], "output": "b.pdf"},
+            {"id": "x", "action": "merge", "inputs": ["a.pdf"], "output": "c.pdf"},
+        ],
+    )
+    with pytest.raises(ValueError, match="Duplicate job ids"):
+        batch.load_manifest(path)
@@ -0,0 +1,95 @@
+import os
+
+import fitz  # PyMuPDF
+import pytest
+
+from app.pdf_tools import EditJournal
+
+
+def page_labels(pdf_document: fitz.Document) -> list[str]:
+    return [page.get_text().strip() for page in pdf_document]
+
+
+def test_operations_refer_to_current_positions():
+    journal = EditJournal(6)
+    assert journal.remove("2,4") == 2
+    assert journal.order == [0, 2, 4, 5]
+    journal.move(3, 0)
+    assert journal.order == [5, 0, 2, 4]
+    journal.reorder([1, 0, 3, 2])
+    assert journal.order == [0, 5, 4, 2]
+    journal.rotate([0, 1], 90)
+    journal.rotate(0, 180)
+    assert journal.rotations == {0: 270, 5: 90}
+    assert len(journal) == 4
+    assert journal.changed
+
+
+def test_invalid_operations_raise():
+    journal = EditJournal(3)
+    with pytest.raises(IndexError):
+        journal.remove(3)
+    with pytest.raises(ValueError):
+        journal.remove("2-5")
+    with pytest.raises(ValueError):
+        journal.reorder([0, 0, 1])
+    with pytest.raises(ValueError):
+        journal.rotate(0, 45)
+    assert not journal.changed
+
+
+def test_apply(make_pdf):
+    with fitz.open(make_pdf(5)) as pdf_document:
+        journal = EditJournal(5)
+        journal.remove("1")
+        journal.move(0, 3)
+        journal.rotate([0], 90)
+        journal.apply(pdf_document)
+        assert page_labels(pdf_document) == ["Page 3", "Page 4", "Page 5", "Page 2"]
+        assert [page.rotation for page in pdf_document] == [90, 0, 0, 0]
+
+
+def test_save_to_new_file(make_pdf, tmp_path):
+    output_path = str(tmp_path / "output.pdf")
+    with fitz.open(make_pdf(4)) as pdf_document:
+        journal = EditJournal(4)
+        journal.remove("2-3")
+        report = journal.save(pdf_document, output_path)
+    assert report.profile != "incremental"
+    assert report.page_count == 2
+    assert report.size == os.path.getsize(output_path)
+    with fitz.open(output_path) as saved:
+        assert page_labels(saved) == ["Page 1", "Page 4"]
+    assert journal.order == [0, 1]
+    assert not journal.changed
+
+
+def test_incremental_save_appends_to_the_file(make_pdf):
+    path = make_pdf(4)
+    original = open(path, "rb").read()
+    with fitz.open(path) as pdf_document:
+        journal = EditJournal(4)
+        journal.remove(0)
+        journal.rotate(0, 90)
+        report = journal.save(pdf_document, path)
+    assert report.profile == "incremental"
+    assert report.page_count == 3
+    updated = open(path, "rb").read()
+    assert updated.startswith(original) and len(updated) > len(original)
+    with fitz.open(path) as saved:
+        assert page_labels(saved) == ["Page 2", "Page 3", "Page 4"]
+        assert saved[0].rotation == 90
+
+
+def test_failed_save_keeps_pending_edits(make_pdf, tmp_path):
+    output_path = str(tmp_path / "missing" / "output.pdf")
+    with fitz.open(make_pdf(3)) as pdf_document:
+        journal = EditJournal(3)
+        journal.remove(1)
+        journal.rotate(0, 90)
+        with pytest.raises(Exception):
+            journal.save(pdf_document, output_path, incremental=False)
+    assert journal.changed
+    assert journal.order == [0, 2]
+    assert journal.rotations == {0: 90}
+    assert not os.path.exists(output_path)
@@ -0,0 +1,28 @@
+import pytest
+
+from app.pdf_tools import parse_page_ranges
+
+
+@pytest.mark.parametrize(
+    "spec, expected",
+    [
+        ("3", [2]),
+        ("1-4", [0, 1, 2, 3]),
+        ("8-", [7, 8, 9]),
+        ("-2", [0, 1]),
+        (" 2 - 3 , 5 ", [1, 2, 4]),
+        ("5,1-2", [4, 0, 1]),
+        ("1-3,2-4,3", [0, 1, 2, 3]),
+        ("1,,2,", [0, 1]),
+        ("", []),
+        ("-", list(range(10))),
+    ],
+)
+def test_parse_page_ranges(spec, expected):
+    assert parse_page_ranges(spec, 10) == expected
+
+
+@pytest.mark.parametrize("spec", ["0", "11", "9-12", "4-2", "a", "1-b", "1-2-3", "1.5"])
+def test_parse_page_ranges_rejects(spec):
+    with pytest.raises(ValueError):
+        parse_page_ranges(spec, 10)
@@ -0,0 +1,47 @@
+from app.pdf_tools import TextIndex, build_text_index, page_words
+
+
+def make_index() -> TextIndex:
+    index = TextIndex(4)
+    index.add(0, page_words("Invoice 2026 for ACME Corp."))
+    index.add(1, page_words("Statement of account; invoice enclosed"))
+    index.add(3, page_words("Account closed"))
+    return index
+
+
+def test_page_words():
+    assert page_words("The cat saw THE Cat-flap") == ["cat", "flap", "saw", "the"]
+
+
+def test_search():
+    index = make_index()
+    assert index.search("invoice") == [0, 1]
+    assert index.search("INVOICE acme") == [0]
+    assert index.search("account") == [1, 3]
+    assert index.search("missing") == []
+    assert index.search("") == []
+    assert index.search(" ;, ") == []
+
+
+def test_last_word_matches_prefixes():
+    index = make_index()
+    assert index.search("acc") == [1, 3]
+    assert index.search("account cl") == [3]
+    assert index.search("acc closed") == []  # only the last word is a prefix
+
+
+def test_search_sees_pages_added_later():
+    index = make_index()
+    assert len(index) == 3 and not index.complete and 2 not in index
+    assert index.search("receipt") == []
+    index.add(2, page_words("Receipt"))
+    assert index.search("rec") == [2]
+    assert index.complete
+
+
+def test_build_text_index(make_pdf):
+    path = make_pdf(5)
+    index = build_text_index(path, TextIndex(5), workers=1)
+    assert index.complete
+    assert index.search("page") == [0, 1, 2, 3, 4]
+    assert index.search("page 4") == [3]